@@ -0,0 +1,143 @@
+"""
+Compare bulk-insert and per-case query times on a fresh SQLite database,
+before (default PRAGMAs, no secondary indexes) and after (the performance
+profile with the model indexes).
+
+    python benchmarks/database.py --buses 10000 --cases 10 --scenarios 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import Select, select
+from sqlmodel import SQLModel
+
+from pss_cli.core.database import Database
+from pss_cli.core.models import BusDefinition, BusValues
+
+CONFIGURATIONS = {
+    "before": ("default", False),
+    "after": ("performance", True),
+}
+
+
+def make_definitions(case_id: int, buses: int) -> Dict[str, np.ndarray]:
+    """Return bus definition columns for one case"""
+
+    numbers = np.arange(1, buses + 1)
+    return {
+        "case_id": np.full(buses, case_id),
+        "bus_number": numbers,
+        "bus_name": np.char.add("BUS", numbers.astype(str)),
+        "bus_base_voltage": np.full(buses, 132.0),
+        "bus_type": np.ones(buses, dtype=np.int64),
+    }
+
+
+def make_values(
+    case_id: int, scenario_id: int, buses: int, rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """Return bus value columns for one case in one scenario"""
+
+    return {
+        "case_id": np.full(buses, case_id),
+        "scenario_id": np.full(buses, scenario_id),
+        "bus_number": np.arange(1, buses + 1),
+        "bus_voltage_pu": rng.uniform(0.9, 1.1, buses),
+        "bus_voltage_kv": rng.uniform(118.8, 145.2, buses),
+        "bus_voltage_angle_deg": rng.uniform(-30, 30, buses),
+    }
+
+
+def time_queries(database: Database, queries: List[Select]) -> float:
+    """Return the mean time to run and fetch each query in seconds"""
+
+    start = time.perf_counter()
+    with database.engine.connect() as connection:
+        for query in queries:
+            connection.execute(query).fetchall()
+
+    return (time.perf_counter() - start) / len(queries)
+
+
+def run(
+    path: str, profile: str, indexed: bool, buses: int, cases: int, scenarios: int
+) -> Tuple[float, float, float]:
+    """
+    Return the insert time and the mean time of a per-case definition query
+    and a per-scenario values query, in seconds
+    """
+
+    database = Database(path, profile=profile)
+    SQLModel.metadata.create_all(bind=database.engine)
+    if not indexed:
+        for table in (BusDefinition.__table__, BusValues.__table__):  # type: ignore
+            for index in table.indexes:
+                index.drop(bind=database.engine)
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for case_id in range(1, cases + 1):
+        with database.engine.begin() as connection:
+            database.bulk_insert_columns(
+                BusDefinition, make_definitions(case_id, buses), connection=connection
+            )
+            for scenario_id in range(1, scenarios + 1):
+                database.bulk_insert_columns(
+                    BusValues,
+                    make_values(case_id, scenario_id, buses, rng),
+                    connection=connection,
+                )
+    insert_time = time.perf_counter() - start
+
+    case_time = time_queries(
+        database,
+        [
+            select(BusDefinition).where(BusDefinition.case_id == case_id)
+            for case_id in range(1, cases + 1)
+        ],
+    )
+    scenario_time = time_queries(
+        database,
+        [
+            select(BusValues).where(BusValues.scenario_id == scenario_id)
+            for scenario_id in range(1, scenarios + 1)
+        ],
+    )
+
+    database.engine.dispose()
+    return insert_time, case_time, scenario_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--buses", type=int, default=10000)
+    parser.add_argument("--cases", type=int, default=10)
+    parser.add_argument("--scenarios", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = args.buses * args.cases * (args.scenarios + 1)
+    print(f"{rows} rows")
+    print(f"{'config':>10} {'insert (s)':>12} {'case (ms)':>12} {'scenario (ms)':>14}")
+    for name, (profile, indexed) in CONFIGURATIONS.items():
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            insert_time, case_time, scenario_time = run(
+                os.path.join(tmp_dir, "sqlite.db"),
+                profile,
+                indexed,
+                args.buses,
+                args.cases,
+                args.scenarios,
+            )
+        print(
+            f"{name:>10} {insert_time:>12.2f} {case_time * 1e3:>12.1f} "
+            f"{scenario_time * 1e3:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compare building branch rows as per-row dictionaries against a columnar
+CaseSnapshot, from synthetic psspy-style column lists.
+
+    python benchmarks/snapshot.py --sizes 10000 100000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from pss_cli.core.snapshot import CaseSnapshot
+from pss_cli.utils.convert import get_list_of_dict
+
+KEYS = [
+    "from_bus_number",
+    "to_bus_number",
+    "branch_id",
+    "from_bus_name",
+    "to_bus_name",
+    "pos_seq_z_pu",
+    "zero_seq_z_pu",
+    "pos_seq_b_pu",
+    "zero_seq_b_pu",
+]
+
+
+def make_columns(size: int, seed: int = 0) -> List[list]:
+    """Return branch columns shaped like the lists psspy returns"""
+
+    rng = random.Random(seed)
+    return [
+        [rng.randint(1, 999999) for _ in range(size)],
+        [rng.randint(1, 999999) for _ in range(size)],
+        ["%-2d" % rng.randint(1, 9) for _ in range(size)],
+        ["BUS%-9d" % rng.randint(1, 999999) for _ in range(size)],
+        ["BUS%-9d" % rng.randint(1, 999999) for _ in range(size)],
+        [complex(rng.random(), rng.random()) for _ in range(size)],
+        [complex(rng.random(), rng.random()) for _ in range(size)],
+        [rng.random() for _ in range(size)],
+        [rng.random() for _ in range(size)],
+    ]
+
+
+def build_dicts(columns: List[list]) -> List[Dict]:
+    """The row dictionary path: transpose, map to dicts, then map to rows"""
+
+    data = get_list_of_dict(keys=KEYS, list_of_tuples=list(zip(*columns)))
+    return [
+        {
+            "case_id": 1,
+            "from_bus_number": branch["from_bus_number"],
+            "to_bus_number": branch["to_bus_number"],
+            "branch_id": branch["branch_id"].strip(),
+            "from_bus_name": branch["from_bus_name"].strip(),
+            "to_bus_name": branch["to_bus_name"].strip(),
+            "pos_seq_r_pu": branch["pos_seq_z_pu"].real,
+            "pos_seq_x_pu": branch["pos_seq_z_pu"].imag,
+            "zero_seq_r_pu": branch["zero_seq_z_pu"].real,
+            "zero_seq_x_pu": branch["zero_seq_z_pu"].imag,
+            "pos_seq_b_pu": branch["pos_seq_b_pu"],
+            "zero_seq_b_pu": branch["zero_seq_b_pu"],
+        }
+        for branch in data
+    ]
+
+
+def build_snapshot(columns: List[list]) -> CaseSnapshot:
+    """The columnar path: one array per column, transformed with NumPy"""
+
+    snapshot = CaseSnapshot()
+    branches = snapshot.add_table("branch", dict(zip(KEYS, columns)))
+    snapshot.add_table(
+        "branchdefinition",
+        {
+            "case_id": np.full(len(columns[0]), 1),
+            "from_bus_number": branches["from_bus_number"],
+            "to_bus_number": branches["to_bus_number"],
+            "branch_id": np.char.strip(branches["branch_id"]),
+            "from_bus_name": np.char.strip(branches["from_bus_name"]),
+            "to_bus_name": np.char.strip(branches["to_bus_name"]),
+            "pos_seq_r_pu": branches["pos_seq_z_pu"].real,
+            "pos_seq_x_pu": branches["pos_seq_z_pu"].imag,
+            "zero_seq_r_pu": branches["zero_seq_z_pu"].real,
+            "zero_seq_x_pu": branches["zero_seq_z_pu"].imag,
+            "pos_seq_b_pu": branches["pos_seq_b_pu"],
+            "zero_seq_b_pu": branches["zero_seq_b_pu"],
+        },
+    )
+    return snapshot
+
+
+def measure(func: Callable, columns: List[list], repeat: int = 3) -> Tuple[float, int]:
+    """Return the best time in seconds and the peak traced memory in bytes"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(columns)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func(columns)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'path':>10} {'time (ms)':>12} {'peak (MB)':>12}")
+    for size in args.sizes:
+        columns = make_columns(size)
+        for name, func in (("dicts", build_dicts), ("snapshot", build_snapshot)):
+            elapsed, peak = measure(func, columns)
+            print(f"{size:>10} {name:>10} {elapsed * 1e3:>12.1f} {peak / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
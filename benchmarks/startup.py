@@ -0,0 +1,55 @@
+"""
+Time CLI startup by running `python -m pss_cli --help` in fresh interpreters,
+failing if the median exceeds the target.
+
+    python benchmarks/startup.py --runs 10 --target 150
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+
+def time_command(args: List[str], runs: int) -> List[float]:
+    """Return the wall time in seconds of each run of a command"""
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target", type=float, default=150, help="milliseconds")
+    parser.add_argument("args", nargs="*", default=["--help"])
+    args = parser.parse_args()
+
+    # The bare interpreter start is the floor the CLI can't go below
+    baseline = time_command([sys.executable, "-c", "pass"], args.runs)
+    times = time_command([sys.executable, "-m", "pss_cli", *args.args], args.runs)
+
+    median = statistics.median(times) * 1e3
+    print(f"{'command':>24} {'min (ms)':>10} {'median (ms)':>12}")
+    for name, values in (
+        ("python -c pass", baseline),
+        ("pss_cli " + " ".join(args.args), times),
+    ):
+        print(
+            f"{name:>24} {min(values) * 1e3:>10.1f} {statistics.median(values) * 1e3:>12.1f}"
+        )
+
+    if median > args.target:
+        print(f"Median {median:.1f} ms exceeds the {args.target:.0f} ms target.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Time the key paths of the CLI at several network sizes against the fake
+psspy, from case loading and subsystem calls through splitting element
+tables and database inserts to printing tables and CLI startup. Results are
+written as JSON, and compared against a baseline written the same way,
+failing if any path got slower by more than the threshold.
+
+    python benchmarks/suite.py --sizes 1000 10000 --output baseline.json
+    python benchmarks/suite.py --sizes 1000 10000 --baseline baseline.json --threshold 20
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from startup import time_command
+
+Result = Dict[str, Any]
+
+
+def measure(
+    path: str,
+    size: int,
+    func: Callable[[], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = 5,
+) -> Result:
+    """
+    Time `repeat` runs of a path after one untimed warm up run, calling
+    `setup` untimed before each
+    """
+
+    times = []
+    for run in range(repeat + 1):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        if run:
+            times.append(time.perf_counter() - start)
+
+    return {
+        "path": path,
+        "size": size,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeat": repeat,
+    }
+
+
+def bench_size(buses: int, repeat: int) -> List[Result]:
+    """Time every path on a synthetic case and scenario of `buses` buses"""
+
+    from sqlmodel import delete
+
+    from pss_cli.core.database import db
+    from pss_cli.core.elements import (
+        BRANCH_DEFINITION_TABLE,
+        DEFINITION_TABLES,
+        VALUES_TABLES,
+        subsystem_specs,
+    )
+    from pss_cli.core.models import Case, Scenario, ScenarioCaseLink
+    from pss_cli.core.ui import print_models
+    from pss_cli.psse.fake.network import generate_network, save_network, vary_dispatch
+    from pss_cli.psse.funcs.extract import extract_columns, extract_data, get_api
+    from pss_cli.utils.convert import get_list_of_dict
+    from pss_cli.utils.hash import get_hash
+
+    case_path, scenario_path = f"case_{buses}.sav", f"scenario_{buses}.sav"
+    network = generate_network(buses, seed=buses)
+    save_network(network, case_path)
+    save_network(vary_dispatch(network, seed=buses + 1), scenario_path)
+
+    with db.session() as session:
+        case = Case(name=case_path, file_path=case_path, md5_hash="")
+        scenario = Scenario(name=scenario_path)
+        link = ScenarioCaseLink(
+            case=case, scenario=scenario, file_path=scenario_path, md5_hash=""
+        )
+        session.add(link)
+        session.commit()
+        session.refresh(case)
+        session.refresh(link)
+
+    api = get_api()
+    api.initialise()
+    branch = subsystem_specs([BRANCH_DEFINITION_TABLE])["brn"]
+    subsystem, mapper = branch
+    attributes = list(mapper.values())
+
+    results = [
+        measure("psspy.case", buses, lambda: api.load_case(case_path), repeat=repeat),
+        measure(
+            "extract_data[branch]",
+            buses,
+            lambda: extract_data(case_path, *branch),
+            repeat=repeat,
+        ),
+        measure(
+            "subsystem_info[branch]",
+            buses,
+            lambda: api.subsystem_info(subsystem, attributes),
+            repeat=repeat,
+        ),
+    ]
+
+    rows = api.subsystem_info(subsystem, attributes)
+    results.append(
+        measure(
+            "get_list_of_dict[branch]",
+            buses,
+            lambda: get_list_of_dict(list(mapper), rows),
+            repeat=repeat,
+        )
+    )
+
+    for label, tables, owner in (
+        ("definitions", DEFINITION_TABLES, case),
+        ("values", VALUES_TABLES, link),
+    ):
+        specs = subsystem_specs(tables)
+
+        def read() -> Dict[str, Any]:
+            return {
+                subsystem_type: extract_columns(owner.file_path, *spec)  # noqa: B023
+                for subsystem_type, spec in specs.items()  # noqa: B023
+            }
+
+        results.append(measure(f"extract_columns[{label}]", buses, read, repeat=repeat))
+
+        data = read()
+        for spec in tables:
+            table = spec.table
+            element = data[spec.subsystem_type]
+            keys = spec.key_columns(element)
+            results.append(
+                measure(
+                    f"columns[{spec.name}]",
+                    buses,
+                    lambda: spec.columns(owner, element, keys),  # noqa: B023
+                    repeat=repeat,
+                )
+            )
+            columns = spec.columns(owner, element, keys)
+
+            def clear() -> None:
+                with db.engine.begin() as connection:
+                    connection.execute(delete(table))  # noqa: B023
+
+            results.append(
+                measure(
+                    f"insert[{table.__tablename__}]",
+                    buses,
+                    lambda: db.bulk_insert_columns(table, columns),  # noqa: B023
+                    setup=clear,
+                    repeat=repeat,
+                )
+            )
+
+    def show() -> None:
+        with open(os.devnull, "w") as f, contextlib.redirect_stdout(f):
+            print_models(db.select_table("busdefinition"))  # type: ignore
+
+    results += [
+        measure("select_table+print_models[bus]", buses, show, repeat=repeat),
+        measure(
+            "get_hash",
+            buses,
+            lambda: get_hash(case_path, verify=True),
+            repeat=repeat,
+        ),
+        measure("get_hash[cached]", buses, lambda: get_hash(case_path), repeat=repeat),
+    ]
+
+    return results
+
+
+def bench_startup(runs: int) -> Result:
+    """Time `pss_cli --help` in fresh interpreters"""
+
+    times = time_command([sys.executable, "-m", "pss_cli", "--help"], runs)
+    return {
+        "path": "cli_startup",
+        "size": 0,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeat": runs,
+    }
+
+
+def compare(
+    results: List[Result], baseline: List[Result], threshold: float, noise: float
+) -> List[Result]:
+    """
+    Add the baseline time and change of each result found in the baseline,
+    flagging it as a regression if it is more than `threshold` percent and
+    `noise` seconds slower. Returns the regressions.
+    """
+
+    previous = {(result["path"], result["size"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["path"], result["size"]))
+        if not base:
+            continue
+
+        result["baseline_s"] = base["min_s"]
+        result["change"] = (result["min_s"] - base["min_s"]) / base["min_s"] * 100
+        result["regression"] = (
+            result["change"] > threshold and result["min_s"] - base["min_s"] > noise
+        )
+        if result["regression"]:
+            regressions.append(result)
+
+    return regressions
+
+
+def print_results(results: List[Result]) -> None:
+    print(
+        f"{'path':>52} {'size':>8} {'min (ms)':>10} {'median (ms)':>12}"
+        f" {'base (ms)':>10} {'change':>8}"
+    )
+    for result in results:
+        line = (
+            f"{result['path']:>52} {result['size']:>8} {result['min_s'] * 1e3:>10.2f}"
+            f" {result['median_s'] * 1e3:>12.2f}"
+        )
+        if "baseline_s" in result:
+            line += f" {result['baseline_s'] * 1e3:>10.2f} {result['change']:>+7.1f}%"
+            if result["regression"]:
+                line += "  REGRESSION"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=20, help="allowed slowdown in percent"
+    )
+    parser.add_argument(
+        "--noise", type=float, default=0.001, help="ignored slowdown in seconds"
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    output = os.path.abspath(args.output) if args.output else None
+
+    # Run against the fake psspy in a scratch directory, which holds the
+    # database, cache and case files
+    from pss_cli.core.config import FAKE_PSSE_ENV
+
+    os.environ[FAKE_PSSE_ENV] = "1"
+    workdir = tempfile.TemporaryDirectory()
+    os.chdir(workdir.name)
+
+    from pss_cli.core.database import db
+
+    db.create_db_and_tables()
+
+    results = [bench_startup(args.repeat)]
+    for size in args.sizes:
+        results += bench_size(size, args.repeat)
+
+    regressions = (
+        compare(results, baseline, args.threshold, args.noise) if baseline else []
+    )
+    print_results(results)
+
+    if output:
+        import numpy as np
+
+        with open(output, "w") as f:
+            meta = {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"Wrote results to '{output}'.")
+
+    if regressions:
+        print(
+            f"{len(regressions)} path(s) regressed by more than {args.threshold:.0f}%."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
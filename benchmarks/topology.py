@@ -0,0 +1,60 @@
+"""
+Time the topology fingerprint of synthetic cases, with branches, machines
+and transformers in typical proportions to the number of buses.
+
+    python benchmarks/topology.py --buses 10000 60000
+"""
+
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+
+from pss_cli.core.snapshot import Columns, topology_fingerprint
+
+
+def make_keys(buses: int, seed: int = 0) -> Dict[str, Columns]:
+    """Return bus, branch, machine and transformer key columns of a case"""
+
+    rng = np.random.default_rng(seed)
+    branches, machines, transformers = int(buses * 1.3), buses // 5, buses // 4
+    return {
+        "bus": {"bus_number": rng.permutation(buses) + 1},
+        "brn": {
+            "from_bus_number": rng.integers(1, buses + 1, branches),
+            "to_bus_number": rng.integers(1, buses + 1, branches),
+            "branch_id": np.array(["1 "] * branches),
+        },
+        "mach": {
+            "bus_number": rng.integers(1, buses + 1, machines),
+            "machine_id": np.array(["1 "] * machines),
+        },
+        "trn": {
+            "from_bus_number": rng.integers(1, buses + 1, transformers),
+            "to_bus_number": rng.integers(1, buses + 1, transformers),
+            "branch_id": np.array(["T1"] * transformers),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--buses", type=int, nargs="+", default=[10000, 60000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'buses':>10} {'elements':>10} {'time (ms)':>12}")
+    for buses in args.buses:
+        tables = make_keys(buses)
+        elements = sum(len(next(iter(t.values()))) for t in tables.values())
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            topology_fingerprint(tables)
+            best = min(best, time.perf_counter() - start)
+        print(f"{buses:>10} {elements:>10} {best * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,8 @@
-from pss_cli.psse.api.base import PsseAPI
+def __getattr__(name):
+    # Imported on first use, as importing the PSSE API starts PSSE
+    if name == "PsseAPI":
+        from pss_cli.psse.api.base import PsseAPI
+
+        return PsseAPI
+
+    raise AttributeError(f"module 'pss_cli' has no attribute '{name}'")
@@ -1,4 +1,3 @@
-import pss_cli
-import sys
+from pss_cli.app import main
 
-sys.exit(pss_cli.main())
\ No newline at end of file
+main()
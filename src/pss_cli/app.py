@@ -1,19 +1,112 @@
+from typing import List, Optional
+
+import click
 import typer
+from typing_extensions import Annotated
+
+from pss_cli.core.lazy import LazyGroup
+from pss_cli.core.profile import Profiler
+
+
+class CommandGroup(LazyGroup):
+    lazy_subcommands = {
+        "add": ("pss_cli.commands.add", "Add cases, scenarios and generators."),
+        "show": ("pss_cli.commands.show", "Show tables from the database."),
+        "extract": ("pss_cli.commands.extract", "Extract data from PSSE cases."),
+        "export": (
+            "pss_cli.commands.export",
+            "Export tables to CSV, JSONL or Parquet.",
+        ),
+        "compare": (
+            "pss_cli.commands.compare",
+            "Compare values between scenarios or cases.",
+        ),
+        "daemon": ("pss_cli.commands.daemon", "Run a PSSE daemon between commands."),
+        "cache": ("pss_cli.commands.cache", "Prune or clear the extraction cache."),
+    }
+
+    def invoke(self, ctx: click.Context):
+        profiler = ctx.params.get("profile")
+        if not profiler:
+            return super().invoke(ctx)
+
+        # Profiled here rather than in the callback, to include the import of
+        # the lazily loaded command module
+        from pss_cli.core.profile import command_name, profile
+
+        def name() -> str:
+            return command_name(ctx.meta.get("pss_cli.command_args", []))
+
+        with profile(profiler, name):
+            return super().invoke(ctx)
+
+    def resolve_command(self, ctx: click.Context, args: List[str]):
+        ctx.meta["pss_cli.command_args"] = list(args)
+        return super().resolve_command(ctx, args)
+
+
+app = typer.Typer(cls=CommandGroup)
+
+
+@app.callback()
+def callback(
+    ctx: typer.Context,
+    metrics: Annotated[
+        bool, typer.Option(help="Print the time, rows and bytes of every stage")
+    ] = False,
+    metrics_output: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Write stage metrics to a file, as JSON for .json files, "
+            "else as OpenMetrics text"
+        ),
+    ] = None,
+    profile: Annotated[
+        Optional[Profiler],
+        typer.Option(
+            help="Profile the command with cProfile or tracemalloc, writing "
+            "the results to .pss_cli_data/profiles"
+        ),
+    ] = None,
+):
+    """Manage PSSE cases and scenarios and the data extracted from them"""
+
+    # --profile is handled by CommandGroup.invoke, which wraps this callback
+
+    # Imported here so `--help` doesn't pay for rich tracebacks or SQLAlchemy
+    from rich.traceback import install
+
+    from pss_cli.core.database import db
+
+    install(show_locals=True)
+    if metrics or metrics_output:
+        enable_metrics(ctx, metrics, metrics_output)
+    db.create_db_if_changed()
+
+
+def enable_metrics(ctx: typer.Context, show: bool, fpath: Optional[str]) -> None:
+    """Collect stage metrics, reporting them once the command has run"""
 
-from rich.traceback import install
+    from pss_cli.core.metrics import metrics
 
-from pss_cli.core.database import db
-from pss_cli.commands import add, show, extract
+    metrics.enable()
 
+    def report() -> None:
+        if show:
+            from pss_cli.core.ui import print_pages
 
-install(show_locals=True)
+            rows = metrics.report()
+            print_pages(
+                f"Stages ({metrics.elapsed:.2f} s)",
+                ["stage", "calls", "time (ms)", "rows", "rows/s", "bytes"],
+                rows,
+                page_size=max(len(rows), 1),
+            )
+        if fpath:
+            metrics.write(fpath)
 
-app = typer.Typer()
-app.add_typer(add.app, name="add")
-app.add_typer(show.app, name="show")
-app.add_typer(extract.app, name="extract")
+    ctx.call_on_close(report)
 
 
 def main():
-    db.create_db_and_tables()
     app()
@@ -1,3 +0,0 @@
-from . import add  # noqa: F401
-from . import show  # noqa: F401
-from . import extract  # noqa: F401
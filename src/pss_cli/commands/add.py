@@ -1,6 +1,5 @@
 import typer
 import pathlib
-import shutil
 import os
 
 from typing import Optional
@@ -15,6 +14,8 @@ from pss_cli.core.models import (
     GeneratingSystem,
     GeneratingSystemSetpoint,
     Generator,
+    BranchDefinition,
+    MachineDefinition,
 )
 
 from pss_cli.core.prompts import (
@@ -24,7 +25,8 @@ from pss_cli.core.prompts import (
     prompt_select_table,
 )
 from pss_cli.core.ui import print_models, print_model
-from pss_cli.utils.hash import get_hash
+from pss_cli.utils.hash import get_hash, set_hash
+from pss_cli.core.io import provision_files
 from pss_cli.core.config import SCENARIO_PATH
 from pss_cli.core.logging import log
 
@@ -34,7 +36,12 @@ app = typer.Typer()
 
 @app.command("scenario")
 def add_scenario(
-    name: str, description: Optional[str] = None, link_all_cases: bool = False
+    name: str,
+    description: Optional[str] = None,
+    link_all_cases: bool = False,
+    verify: bool = False,
+    threads: int = 4,
+    hardlink: bool = False,
 ):
     """Add a scenario to the database"""
 
@@ -48,20 +55,28 @@ def add_scenario(
     directory = pathlib.Path(SCENARIO_PATH)
     os.makedirs(directory, exist_ok=True)
 
-    scenario_case_links = []
+    pairs = []
     for case in cases:  # type: ignore
         case_file_path = pathlib.Path(case.file_path)  # type: ignore
         extension = case_file_path.suffix
         file_name = f"{case.name} - {scenario.name}{extension}"
-        file_path = directory.joinpath(file_name)
+        pairs.append((str(case_file_path), str(directory.joinpath(file_name))))
 
-        shutil.copy(src=case_file_path, dst=file_path)
+    if hardlink:
+        log.warning("Scenario files are hard linked until they are saved by PSSE.")
+
+    provisioned = provision_files(pairs, threads=threads, hardlink=hardlink)
+
+    scenario_case_links = []
+    for case, file in zip(cases, provisioned):  # type: ignore
+        # Copies that share their content with the case reuse its hash
+        md5_hash = file.md5_hash or get_hash(file.src, verify=verify)
+        set_hash(file.dst, md5_hash)
 
-        md5_hash = get_hash(str(file_path))
         scenario_case_link = ScenarioCaseLink(
             case=case,
             scenario=scenario,
-            file_path=str(file_path),
+            file_path=file.dst,
             md5_hash=md5_hash,
         )
         scenario_case_links.append(scenario_case_link)
@@ -81,6 +96,7 @@ def add_case(
     description: Optional[str] = None,
     root_dir=".",
     match_pattern: str = "*.sav",
+    verify: bool = False,
 ):
     """Add a case to the database"""
 
@@ -90,7 +106,7 @@ def add_case(
         log.error("No file selected.")
         return
 
-    md5_hash = get_hash(fpath)
+    md5_hash = get_hash(fpath, verify=verify)
 
     case = Case(
         name=name, description=description, file_path=str(fpath), md5_hash=md5_hash
@@ -111,7 +127,9 @@ def add_generating_system(name: str):
     case = prompt_select_table("case", parameters=None)
 
     branch = prompt_select_table(
-        "branchdefinition", parameters=["from_bus_number", "to_bus_number", "branch_id"]
+        "branchdefinition",
+        parameters=["from_bus_number", "to_bus_number", "branch_id"],
+        where=BranchDefinition.case_id == case.id,
     )
     reversed = prompt_bool(message="Reverse power flow direction?")
     from_bus = branch.from_bus_number
@@ -136,7 +154,9 @@ def add_generator():
 
     generating_system = prompt_select_table("generatingsystem", parameters=["name"])
     machine = prompt_select_table(
-        "machinedefinition", parameters=["machine_name", "bus_number", "machine_id"]
+        "machinedefinition",
+        parameters=["machine_name", "bus_number", "machine_id"],
+        where=MachineDefinition.case_id == generating_system.case_id,
     )
     generator = Generator(
         bus_number=machine.bus_number,
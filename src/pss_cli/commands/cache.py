@@ -0,0 +1,24 @@
+import typer
+
+from pss_cli.core.cache import prune_cache
+from pss_cli.core.database import db
+from pss_cli.core.logging import log
+from pss_cli.utils.memory import format_bytes
+
+app = typer.Typer()
+
+
+@app.command("prune")
+def prune():
+    """Delete cached columns of files no case or scenario refers to anymore"""
+
+    count, nbytes = prune_cache(keep=db.file_hashes())
+    log.info(f"Deleted the cached columns of {count} file(s), {format_bytes(nbytes)}.")
+
+
+@app.command("clear")
+def clear():
+    """Delete every cached column, they are read again on the next extraction"""
+
+    count, nbytes = prune_cache()
+    log.info(f"Deleted the cached columns of {count} file(s), {format_bytes(nbytes)}.")
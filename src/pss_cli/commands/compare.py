@@ -0,0 +1,208 @@
+import time
+import typer
+from typing import List, Optional, Type, Union
+from typing_extensions import Annotated
+from sqlalchemy import ColumnElement, Table
+from sqlmodel import and_, select
+
+from pss_cli.core.compare import Comparison, compare_columns, top_movers
+from pss_cli.core.database import db
+from pss_cli.core.elements import ELEMENTS
+from pss_cli.core.logging import log
+from pss_cli.core.models import Case, Scenario
+from pss_cli.core.ui import print_pages
+
+app = typer.Typer()
+
+# Quantity ranking the top movers of each element type by default
+QUANTITIES = {
+    "bus": "bus_voltage_pu",
+    "branch": "active_power_mw",
+    "machine": "active_power_mw",
+    "transformer": "ratio",
+}
+
+Quantity = Annotated[
+    Optional[str],
+    typer.Option(help="Quantity to rank the top movers on, e.g. reactive_power_mvar."),
+]
+Top = Annotated[int, typer.Option(min=1, help="Number of top movers to show.")]
+
+
+def get_by_name(model: Type[Union[Case, Scenario]], name: str) -> Union[Case, Scenario]:
+    """Return the case or scenario with a name, raising ValueError if there is none"""
+
+    with db.session() as session:
+        obj = session.exec(select(model).where(model.name == name)).first()
+
+    if obj is None:
+        raise ValueError(f"No {model.__tablename__} named '{name}' found.")
+
+    return obj
+
+
+def values_table(element: str) -> Table:
+    """Return the values table of an element type"""
+
+    prefix = ELEMENTS.get(element)
+    if not prefix:
+        raise ValueError(
+            f"Unknown element type '{element}', use one of: {', '.join(ELEMENTS)}"
+        )
+
+    return db.get_table_object(f"{prefix}values").__table__
+
+
+def format_value(value: float) -> str:
+    return f"{value:.6g}"
+
+
+def print_comparison(
+    element: str,
+    comparison: Comparison,
+    labels: List[str],
+    quantity: str,
+    top: int,
+) -> None:
+    """Print a summary of the changes of every quantity and the top movers"""
+
+    log.info(
+        f"Compared {len(comparison.delta[quantity])} {element}(s) in both, "
+        f"{comparison.only_first} only in '{labels[0]}' and "
+        f"{comparison.only_second} only in '{labels[1]}'."
+    )
+
+    summary = [
+        (
+            name,
+            int((delta != 0).sum()),
+            format_value(abs(delta).max() if len(delta) else 0.0),
+            format_value(abs(delta).mean() if len(delta) else 0.0),
+        )
+        for name, delta in comparison.delta.items()
+    ]
+    print_pages(
+        "Changes", ["quantity", "changed", "max |delta|", "mean |delta|"], summary
+    )
+
+    index = top_movers(comparison.delta[quantity], top)
+    columns = [
+        *comparison.keys,
+        f"{quantity} ({labels[0]})",
+        f"{quantity} ({labels[1]})",
+        "delta",
+        "change %",
+    ]
+    rows = zip(
+        *(comparison.keys[key][index].tolist() for key in comparison.keys),
+        *(
+            map(format_value, values[quantity][index].tolist())
+            for values in (
+                comparison.first,
+                comparison.second,
+                comparison.delta,
+                comparison.percent,
+            )
+        ),
+    )
+    print_pages(f"Top {top} movers", columns, rows)
+
+
+def compare(
+    element: str,
+    first: ColumnElement[bool],
+    second: ColumnElement[bool],
+    labels: List[str],
+    keys: List[str],
+    quantity: Optional[str],
+    top: int,
+) -> None:
+    """
+    Load the values of an element type selected by two where clauses as
+    arrays aligned on `keys` and the element keys, and print their differences
+    """
+
+    table = values_table(element)
+    element_keys = [
+        column.name
+        for column in table.primary_key
+        if column.name not in ("case_id", "scenario_id")
+    ]
+    quantities = [column.name for column in table.columns if not column.primary_key]
+    quantity = quantity or QUANTITIES[element]
+    if quantity not in quantities:
+        raise ValueError(
+            f"Unknown quantity '{quantity}', use one of: {', '.join(quantities)}"
+        )
+
+    start = time.perf_counter()
+    # Rows come in extraction order, so the values of an unchanged topology
+    # line up without sorting and the others are sorted once when joined
+    keys = [*keys, *element_keys]
+    statement = select(*(table.c[key] for key in keys + quantities))
+    comparison = compare_columns(
+        db.select_columns(statement.where(first)),
+        db.select_columns(statement.where(second)),
+        keys,
+        quantities,
+    )
+    log.info(f"Loaded and compared values in {time.perf_counter() - start:.2f} s.")
+
+    print_comparison(element, comparison, labels, quantity, top)
+
+
+@app.command("scenarios")
+def compare_scenarios(
+    element: str,
+    first: str,
+    second: str,
+    case: Annotated[
+        Optional[str], typer.Option(help="Only compare the values of this case.")
+    ] = None,
+    quantity: Quantity = None,
+    top: Top = 10,
+):
+    """
+    Compare the values of an element type (bus, branch, machine or
+    transformer) between two scenarios, for every case or a single one
+    """
+
+    try:
+        table = values_table(element)
+        scenarios = [get_by_name(Scenario, name) for name in (first, second)]
+        where = [table.c.scenario_id == scenario.id for scenario in scenarios]
+        if case:
+            case_id = get_by_name(Case, case).id
+            where = [and_(clause, table.c.case_id == case_id) for clause in where]
+
+        compare(element, *where, [first, second], ["case_id"], quantity, top)
+    except ValueError as e:
+        log.error(e)
+
+
+@app.command("cases")
+def compare_cases(
+    element: str,
+    first: str,
+    second: str,
+    scenario: Annotated[str, typer.Option(help="Scenario to compare the cases in.")],
+    quantity: Quantity = None,
+    top: Top = 10,
+):
+    """
+    Compare the values of an element type (bus, branch, machine or
+    transformer) between two cases in a scenario, matching elements on their
+    numbers and ids
+    """
+
+    try:
+        table = values_table(element)
+        scenario_id = get_by_name(Scenario, scenario).id
+        cases = [get_by_name(Case, name) for name in (first, second)]
+        where = [
+            and_(table.c.case_id == case.id, table.c.scenario_id == scenario_id)
+            for case in cases
+        ]
+        compare(element, *where, [first, second], [], quantity, top)
+    except ValueError as e:
+        log.error(e)
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import time
+import typer
+from typing import Optional
+from typing_extensions import Annotated
+
+from pss_cli.core.config import DAEMON_PATH
+from pss_cli.core.logging import log
+from pss_cli.psse.funcs.daemon import DaemonError, connect, serve
+from pss_cli.utils.memory import format_bytes
+
+app = typer.Typer()
+
+
+def spawn(
+    psspy_module: Optional[str] = None,
+    table_cache_mb: Optional[int] = None,
+    timeout: float = 60,
+) -> bool:
+    """
+    Start the daemon in a background process, logging to the daemon
+    directory, and wait until it accepts connections
+    """
+
+    args = [sys.executable, "-m", "pss_cli", "daemon", "start"]
+    if table_cache_mb is not None:
+        args += ["--table-cache-mb", str(table_cache_mb)]
+    if psspy_module:
+        args += ["--psspy-module", psspy_module]
+
+    os.makedirs(DAEMON_PATH, exist_ok=True)
+    with open(os.path.join(DAEMON_PATH, "daemon.log"), "ab") as f:
+        if sys.platform == "win32":
+            flags = subprocess.CREATE_NEW_PROCESS_GROUP | 0x00000008  # DETACHED
+            process = subprocess.Popen(args, stdout=f, stderr=f, creationflags=flags)
+        else:
+            process = subprocess.Popen(args, stdout=f, stderr=f, start_new_session=True)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        client = connect()
+        if client:
+            client.close()
+            return True
+        time.sleep(0.1)
+
+    return False
+
+
+@app.command("start")
+def start_daemon(
+    detach: Annotated[
+        bool, typer.Option(help="Run the daemon in a background process")
+    ] = False,
+    table_cache_mb: Annotated[
+        Optional[int],
+        typer.Option(min=0, help="Memory budget of extracted tables kept in memory"),
+    ] = None,
+    psspy_module: Annotated[
+        Optional[str], typer.Option(hidden=True, help="Module standing in for psspy")
+    ] = None,
+):
+    """Start a PSSE daemon that keeps PSSE initialised between commands"""
+
+    if detach:
+        if spawn(psspy_module, table_cache_mb):
+            log.info("[green]PSSE daemon started.[/green]")
+        else:
+            log.error(
+                "PSSE daemon failed to start, see "
+                f"'{os.path.join(DAEMON_PATH, 'daemon.log')}'."
+            )
+        return
+
+    budget = table_cache_mb * 1024 * 1024 if table_cache_mb is not None else None
+    try:
+        serve(psspy_module, budget)
+    except DaemonError as e:
+        log.error(e)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("stop")
+def stop_daemon():
+    """Stop the running PSSE daemon"""
+
+    client = connect()
+    if not client:
+        log.error("No PSSE daemon is running.")
+        return
+
+    with client:
+        client.shutdown()
+    log.info("PSSE daemon stopped.")
+
+
+@app.command("status")
+def daemon_status():
+    """Show the status of the PSSE daemon"""
+
+    client = connect()
+    if not client:
+        log.info("No PSSE daemon is running.")
+        return
+
+    with client:
+        stats = client.stats()
+
+    tables = stats["table_cache"]
+    log.info(
+        f"PSSE daemon running (pid {stats['pid']}) for {stats['uptime']:.0f} s, "
+        f"served {stats['requests']} requests with {stats['case_loads']} case "
+        f"load(s). Loaded case: {stats['loaded_case']}"
+    )
+    log.info(
+        f"Table cache: {tables['tables']} table(s), {format_bytes(tables['nbytes'])}, "
+        f"{tables['hits']} hit(s), {tables['misses']} miss(es), "
+        f"{tables['evictions']} eviction(s)."
+    )
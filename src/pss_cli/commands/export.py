@@ -0,0 +1,156 @@
+import os
+import time
+import typer
+from typing import List, Optional
+from typing_extensions import Annotated
+from sqlalchemy.exc import DBAPIError
+
+from pss_cli.core.database import db
+from pss_cli.core.elements import ELEMENTS
+from pss_cli.core.export import WRITERS
+from pss_cli.core.logging import log
+
+app = typer.Typer()
+
+Where = Annotated[
+    Optional[str],
+    typer.Option(help='SQL filter, e.g. "case_id = 1 AND scenario_id = 2".'),
+]
+Columns = Annotated[
+    Optional[str], typer.Option(help="Comma separated columns to export.")
+]
+OrderBy = Annotated[
+    Optional[str], typer.Option(help='SQL ordering, e.g. "bus_number DESC".')
+]
+Limit = Annotated[
+    Optional[int], typer.Option(min=0, help="Maximum number of rows to export.")
+]
+Format = Annotated[
+    Optional[str],
+    typer.Option(
+        "--format", help="csv, jsonl or parquet, defaults to the file extension."
+    ),
+]
+BatchSize = Annotated[
+    int, typer.Option(min=1, help="Number of rows fetched and written at a time.")
+]
+
+
+def get_format(output: str, format: Optional[str]) -> str:
+    """Return the export format, from the output file extension if not given"""
+
+    format = (format or os.path.splitext(output)[1].lstrip(".")).lower()
+    if format not in WRITERS:
+        raise ValueError(
+            f"Unknown export format '{format}', use one of: {', '.join(WRITERS)}"
+        )
+
+    return format
+
+
+def export(
+    table_name: str,
+    output: str,
+    format: Optional[str] = None,
+    where: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 10000,
+    join: Optional[str] = None,
+) -> None:
+    """Stream the rows of a table, or a join, to a file one batch at a time"""
+
+    try:
+        writer = WRITERS[get_format(output, format)]
+        statement = db.select_statement(
+            table_name,
+            columns=columns,
+            where=where,
+            order_by=order_by,
+            limit=limit,
+            join=join,
+        )
+
+        start = time.perf_counter()
+        count = writer(
+            output,
+            list(statement.selected_columns),
+            db.stream_batches(statement, batch_size=batch_size),
+        )
+        elapsed = time.perf_counter() - start
+    except (ValueError, ImportError) as e:
+        log.error(e)
+        return
+    except DBAPIError as e:
+        log.error(f"Invalid query: {e.orig}")
+        return
+
+    log.info(f"[green]Exported {count} rows to '{output}' in {elapsed:.2f} s.[/green]")
+
+
+def split_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Return a list of column names from a comma separated string"""
+
+    return [column.strip() for column in columns.split(",")] if columns else None
+
+
+@app.command(name="table")
+def export_table(
+    name: str,
+    output: str,
+    format: Format = None,
+    where: Where = None,
+    columns: Columns = None,
+    order_by: OrderBy = None,
+    limit: Limit = None,
+    batch_size: BatchSize = 10000,
+):
+    """Export a database table to CSV, JSON Lines or Parquet"""
+
+    export(
+        name,
+        output,
+        format=format,
+        where=where,
+        columns=split_columns(columns),
+        order_by=order_by,
+        limit=limit,
+        batch_size=batch_size,
+    )
+
+
+@app.command(name="results")
+def export_results(
+    element: str,
+    output: str,
+    format: Format = None,
+    where: Where = None,
+    columns: Columns = None,
+    order_by: OrderBy = None,
+    limit: Limit = None,
+    batch_size: BatchSize = 10000,
+):
+    """
+    Export the values of an element type (bus, branch, machine or
+    transformer) for every case and scenario, joined with their definitions
+    """
+
+    prefix = ELEMENTS.get(element)
+    if not prefix:
+        log.error(
+            f"Unknown element type '{element}', use one of: {', '.join(ELEMENTS)}"
+        )
+        return
+
+    export(
+        f"{prefix}values",
+        output,
+        format=format,
+        where=where,
+        columns=split_columns(columns),
+        order_by=order_by,
+        limit=limit,
+        batch_size=batch_size,
+        join=f"{prefix}definition",
+    )
@@ -1,285 +1,362 @@
-from operator import pos
-from sqlmodel import SQLModel, and_
+from collections import defaultdict
+from sqlalchemy import literal_column
+from sqlmodel import SQLModel, delete, select
 import typer
 
-from abc import ABC, abstractmethod
-from typing import Sequence, Type
-from pss_cli.psse.funcs.extract import (
-    extract_bus_definitions,
-    extract_branch_definitions,
-    extract_machine_definitions,
-    extract_two_winding_transformer_definitions,
-    extract_bus_values,
-    extract_branch_values,
-    extract_machine_values,
-    extract_two_winding_transformer_values,
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
 )
+from typing_extensions import Annotated
+
+from pss_cli.psse.funcs.pool import extract_files
+from pss_cli.core.cache import prune_cache, table_nbytes
 from pss_cli.core.database import db
+from pss_cli.core.elements import (
+    DEFINITION_TABLES,
+    VALUES_TABLES,
+    Owner,
+    TableSpec,
+    subsystem_specs,
+)
 from pss_cli.core.logging import log
-from pss_cli.core.models import (
-    Case,
-    BusDefinition,
-    BranchDefinition,
-    MachineDefinition,
-    TwoWindingTransformerDefinition,
-    BusValues,
-    BranchValues,
-    MachineValues,
-    TwoWindingTransformerValues,
-    ScenarioCaseLink,
+from pss_cli.core.metrics import metrics
+from pss_cli.core.models import ScenarioCaseLink
+from pss_cli.core.snapshot import (
+    CaseSnapshot,
+    Columns,
+    columns_fingerprint,
+    num_rows,
+    slice_columns,
+    topology_fingerprint,
 )
+from pss_cli.utils.hash import get_hash
+from pss_cli.utils.memory import format_bytes, get_peak_rss
 
 app = typer.Typer()
 
 
-class ValuesObjExtractor(ABC):
-    @abstractmethod
-    def extract(
-        self, scenario_case_link: ScenarioCaseLink, refresh: bool = True
-    ) -> Sequence[SQLModel]:
-        raise NotImplementedError
-
-
-class ValuesObjExtractorFactory:
-    @staticmethod
-    def create_extractor(
-        extractor_type: Type[ValuesObjExtractor],
-    ) -> ValuesObjExtractor:
-        return extractor_type()
-
-
-class DefinitionObjExtractor(ABC):
-    @abstractmethod
-    def extract(self, case: Case, refresh: bool = True) -> Sequence[SQLModel]:
-        raise NotImplementedError
-
-
-class DefinitionObjExtractorFactory:
-    @staticmethod
-    def create_extractor(
-        extractor_type: Type[DefinitionObjExtractor],
-    ) -> DefinitionObjExtractor:
-        return extractor_type()
-
-
-class BusDefinitionObjExtractor(DefinitionObjExtractor):
-    def extract(self, case: Case, refresh: bool = True) -> Sequence[BusDefinition]:
-        """Create a list of BusDefintion objects to add to the database"""
-
-        busses = extract_bus_definitions(case.file_path)
-        objs = [
-            BusDefinition(
-                case_id=case.id,
-                bus_number=bus["bus_number"],
-                bus_name=bus["bus_name"].strip(),
-                bus_base_voltage=bus["bus_base_voltage"],
-                bus_type=bus["bus_type"],
+def extract_owners(
+    owners: Sequence[Owner],
+    tables: Sequence[TableSpec],
+    workers: int = 1,
+    hashes: Optional[Mapping[str, str]] = None,
+    daemon: bool = True,
+    known_keys: Collection[str] = (),
+) -> Iterator[Tuple[Owner, CaseSnapshot]]:
+    """
+    Read the attributes of the tables for every case or scenario case link,
+    loading each case file once, and yield a snapshot of each case file as it
+    completes, with one table per element type. Files with an md5 hash in
+    `hashes` use the on-disk cache. With `daemon` set, a running PSSE daemon
+    does the extraction. Key attributes aren't read for the `known_keys`
+    files.
+    """
+
+    owners_by_path = defaultdict(list)
+    for owner in owners:
+        owners_by_path[owner.file_path].append(owner)
+
+    specs = subsystem_specs(tables)
+    keyless_specs = subsystem_specs(tables, keys=False)
+    jobs = {
+        fpath: keyless_specs if fpath in known_keys else specs
+        for fpath in owners_by_path
+    }
+
+    results = extract_files(jobs, workers=workers, hashes=hashes, daemon=daemon)
+    for fpath, snapshot in results:
+        for owner in owners_by_path[fpath]:
+            yield owner, snapshot
+
+    log.info(f"Extracted data from {len(jobs)} case file(s).")
+
+
+def get_topology(tables: Sequence[TableSpec], keys: Mapping[str, Columns]) -> str:
+    """Return the topology fingerprint of the element key columns of the tables"""
+
+    with metrics.span("topology.fingerprint"):
+        return topology_fingerprint(
+            {spec.subsystem_type: keys[spec.name] for spec in tables}
+        )
+
+
+def element_keys(
+    tables: Sequence[TableSpec], snapshot: CaseSnapshot
+) -> Dict[str, Columns]:
+    """
+    Return the element key columns of each table, read from the same case
+    file as the rest of its columns, so rows always carry their own keys
+    """
+
+    return {
+        spec.name: spec.key_columns(snapshot[spec.subsystem_type]) for spec in tables
+    }
+
+
+def base_keys(
+    tables: Sequence[TableSpec],
+    scenario_case_link: ScenarioCaseLink,
+    snapshot: CaseSnapshot,
+) -> Dict[str, Columns]:
+    """
+    Return the element key columns of each values table stored with the
+    definitions of the scenario case link's base case, in extraction order,
+    which line up with the rows of the snapshot of an identical file
+    """
+
+    keys = {}
+    for spec in tables:
+        table = spec.definition.__table__  # type: ignore
+        statement = (
+            select(*(table.c[field.column] for field in spec.keys))
+            .where(table.c.case_id == scenario_case_link.case_id)
+            .order_by(literal_column("rowid"))
+        )
+        keys[spec.name] = db.select_columns(statement)
+
+        count = snapshot.num_rows(spec.subsystem_type)
+        if num_rows(keys[spec.name]) != count:
+            raise ValueError(
+                f"{scenario_case_link.file_path} has {count} {spec.name} rows, "
+                f"its base case has {num_rows(keys[spec.name])}."
             )
-            for bus in busses
-        ]
-
-        return objs
-
-
-class BranchDefinitionObjExtractor(DefinitionObjExtractor):
-    def extract(self, case: Case, refresh: bool = True) -> Sequence[BranchDefinition]:
-        """Create a list of BranchDefintion objects to add to the database"""
-
-        branches = extract_branch_definitions(case.file_path)
-        objs = [
-            BranchDefinition(
-                case_id=case.id,
-                from_bus_number=branch["from_bus_number"],
-                to_bus_number=branch["to_bus_number"],
-                branch_id=branch["branch_id"].strip(),
-                from_bus_name=branch["from_bus_name"].strip(),
-                to_bus_name=branch["to_bus_name"].strip(),
-                pos_seq_r_pu=branch["pos_seq_z_pu"].real,
-                pos_seq_x_pu=branch["pos_seq_z_pu"].imag,
-                zero_seq_r_pu=branch["zero_seq_z_pu"].real,
-                zero_seq_x_pu=branch["zero_seq_z_pu"].imag,
-                pos_seq_b_pu=branch["pos_seq_b_pu"],
-                zero_seq_b_pu=branch["zero_seq_b_pu"],
-            )
-            for branch in branches
-        ]
-
-        return objs
-
 
-class MachineDefinitionObjExtractor(DefinitionObjExtractor):
-    def extract(self, case: Case, refresh: bool = True) -> Sequence[MachineDefinition]:
-        """Create a list of MachineDefintion objects to add to the database"""
-
-        machines = extract_machine_definitions(case.file_path)
-        objs = [
-            MachineDefinition(
-                case_id=case.id,
-                bus_number=machine["bus_number"],
-                machine_name=machine["machine_name"],
-                machine_id=machine["machine_id"].strip(),
-            )
-            for machine in machines
-        ]
-
-        return objs
-
-
-class TwoWindingTransformerDefinitionObjExtractor(DefinitionObjExtractor):
-    def extract(
-        self, case: Case, refresh: bool = True
-    ) -> Sequence[TwoWindingTransformerDefinition]:
-        """Create a list of TwoWindingTransformerDefinition objects to add to the database"""
-
-        transformers = extract_two_winding_transformer_definitions(case.file_path)
-        objs = [
-            TwoWindingTransformerDefinition(
-                case_id=case.id,
-                from_bus_number=transformer["from_bus_number"],
-                to_bus_number=transformer["to_bus_number"],
-                branch_id=transformer["branch_id"].strip(),
-                xfr_name=transformer["xfr_name"],
-                pos_seq_r_pu=transformer["pos_seq_impedance_pu"].real,
-                pos_seq_x_pu=transformer["pos_seq_impedance_pu"].imag,
-                zero_seq_r_pu=transformer["zero_seq_impedance_pu"].real,
-                zero_seq_x_pu=transformer["zero_seq_impedance_pu"].imag,
-                vector_group=transformer["vector_group"],
-                controlled_bus_number=transformer["controlled_bus_number"],
-                sbase_mva=transformer["sbase_mva"],
-                rmax_pu=transformer["rmax_pu"],
-                rmin_pu=transformer["rmin_pu"],
-                vmax_pu=transformer["vmax_pu"],
-                vmin_pu=transformer["vmin_pu"],
-            )
-            for transformer in transformers
-        ]
-
-        return objs
-
-
-class BusValuesObjExtractor(ValuesObjExtractor):
-    def extract(
-        self, scenario_case_link: ScenarioCaseLink, refresh: bool = True
-    ) -> Sequence[BusValues]:
-        """Create a list of ScenarioBusValues objects to add to the database"""
-
-        # NOTE: probably need better error handling
-        if not scenario_case_link:
-            log.error("No database row found.")
-
-        bus_values = extract_bus_values(scenario_case_link.file_path)  # type: ignore
-        objs = [
-            BusValues(
-                case_id=scenario_case_link.case.id,
-                scenario_id=scenario_case_link.scenario.id,
-                bus_number=bus["bus_number"],
-                bus_voltage_pu=bus["bus_voltage_pu"],
-                bus_voltage_kv=bus["bus_voltage_kv"],
-                bus_voltage_angle_deg=bus["bus_voltage_angle_deg"],
-            )
-            for bus in bus_values
-        ]
-
-        return objs
-
-
-class BranchValuesObjExtractor(ValuesObjExtractor):
-    def extract(
-        self, scenario_case_link: ScenarioCaseLink, refresh: bool = True
-    ) -> Sequence[BranchValues]:
-        """Create a list of ScenarioBranchValues objects to add to the database"""
-
-        # NOTE: probably need better error handling
-        if not scenario_case_link:
-            log.error("No database row found.")
-
-        branch_values = extract_branch_values(scenario_case_link.file_path)  # type: ignore
-        objs = [
-            BranchValues(
-                case_id=scenario_case_link.case.id,
-                scenario_id=scenario_case_link.scenario.id,
-                from_bus_number=branch["from_bus_number"],
-                to_bus_number=branch["to_bus_number"],
-                branch_id=branch["branch_id"].strip(),
-                active_power_mw=branch["active_power_mw"],
-                reactive_power_mvar=branch["reactive_power_mvar"],
+    return keys
+
+
+def base_key_files(
+    owners: Sequence[Owner],
+    tables: Sequence[TableSpec],
+    file_hashes: Mapping[str, str],
+) -> Set[str]:
+    """
+    Return the files of scenario case links whose keys are those of their
+    base case, as the file is the one the base case's definitions were
+    extracted from, e.g. a fresh copy of it
+    """
+
+    links = [owner for owner in owners if isinstance(owner, ScenarioCaseLink)]
+    if not links or not all(spec.definition for spec in tables):
+        return set()
+
+    extracted = {
+        case.id: case.extracted_hash for case in db.select_table("case")  # type: ignore
+    }
+    files = {link.file_path for link in links}
+    for owner in owners:
+        if (
+            not isinstance(owner, ScenarioCaseLink)
+            or extracted.get(owner.case_id) != file_hashes[owner.file_path]
+        ):
+            files.discard(owner.file_path)
+
+    return files
+
+
+def table_columns(
+    owner: Owner,
+    tables: Sequence[TableSpec],
+    snapshot: CaseSnapshot,
+    keys: Mapping[str, Columns],
+) -> Dict[str, Columns]:
+    """Split a snapshot into the table columns of a case or scenario case link"""
+
+    columns = {}
+    for spec in tables:
+        with metrics.span("tables.columns") as span:
+            data = snapshot[spec.subsystem_type]
+            columns[spec.name] = spec.columns(owner, data, keys[spec.name])
+            span.add(
+                rows=num_rows(columns[spec.name]),
+                nbytes=table_nbytes(columns[spec.name]),
             )
-            for branch in branch_values
-        ]
-
-        return objs
-
-
-class MachineValuesObjExtractor(ValuesObjExtractor):
-    def extract(
-        self, scenario_case_link: ScenarioCaseLink, refresh: bool = True
-    ) -> Sequence[MachineValues]:
-        """Create a list of MachineValues objects to add to the database"""
-
-        # NOTE: probably need better error handling
-        if not scenario_case_link:
-            log.error("No database row found.")
-
-        machine_values = extract_machine_values(scenario_case_link.file_path)  # type: ignore
-        objs = [
-            MachineValues(
-                case_id=scenario_case_link.case.id,
-                scenario_id=scenario_case_link.scenario.id,
-                bus_number=machine["bus_number"],
-                machine_id=machine["machine_id"].strip(),
-                mbase_mva=machine["mbase_mva"],
-                active_power_mw=machine["active_power_mw"],
-                reactive_power_mvar=machine["reactive_power_mvar"],
-                pmax=machine["pmax"],
-                pmin=machine["pmin"],
-                qmax=machine["qmax"],
-                qmin=machine["qmin"],
-            )
-            for machine in machine_values
-        ]
-
-        return objs
-
-
-class TwoWindingTransformerValuesObjExtractor(ValuesObjExtractor):
-    def extract(
-        self, scenario_case_link: ScenarioCaseLink, refresh: bool = True
-    ) -> Sequence[TwoWindingTransformerValues]:
-        """Create a list of TwoWindingTransformerValues objects to add to the database"""
-
-        # NOTE: probably need better error handling
-        if not scenario_case_link:
-            log.error("No database row found.")
-
-        transformer_values = extract_two_winding_transformer_values(
-            scenario_case_link.file_path
-        )  # type: ignore
-        objs = [
-            TwoWindingTransformerValues(
-                case_id=scenario_case_link.case.id,
-                scenario_id=scenario_case_link.scenario.id,
-                from_bus_number=transformer["from_bus_number"],
-                to_bus_number=transformer["to_bus_number"],
-                branch_id=transformer["branch_id"].strip(),
-                ratio=transformer["ratio"],
-            )
-            for transformer in transformer_values
-        ]
 
-        return objs
+    return columns
+
+
+def get_definitions(columns: Mapping[str, Columns]) -> str:
+    """Return the content fingerprint of the table columns of a case"""
+
+    with metrics.span("definitions.fingerprint"):
+        return columns_fingerprint(columns)
+
+
+def extract_batches(
+    tables: Sequence[TableSpec],
+    columns: Mapping[str, Columns],
+    batch_size: int = 10000,
+) -> Iterator[Tuple[Type[SQLModel], Columns]]:
+    """Yield batches of up to `batch_size` rows of the columns of each table"""
+
+    for spec in tables:
+        data = columns[spec.name]
+        for start in range(0, num_rows(data), batch_size):
+            yield spec.table, slice_columns(data, start, start + batch_size)
+
+
+def replace_rows(
+    owner: Owner,
+    tables: Sequence[TableSpec],
+    batches: Iterable[Tuple[Type[SQLModel], Columns]],
+    hashes: Mapping[str, Optional[str]],
+) -> int:
+    """
+    Atomically replace the rows of a case or scenario case link with the
+    extracted batches and record the hashes of the file and content they
+    were extracted from, e.g. `md5_hash`. Batches are written as they arrive.
+    Returns the number of rows inserted.
+    """
+
+    with db.engine.connect() as connection:
+        transaction = connection.begin()
+        with metrics.span("db.delete"):
+            for spec in tables:
+                connection.execute(delete(spec.table).where(spec.where(owner)))
+
+        count = sum(
+            db.bulk_insert_columns(table, columns, connection=connection)
+            for table, columns in batches
+        )
+        db.update_columns(
+            owner,
+            {**hashes, "extracted_hash": hashes["md5_hash"]},
+            connection=connection,
+        )
+        with metrics.span("db.commit"):
+            transaction.commit()
+
+    return count
+
+
+def refresh_owners(
+    owners: Sequence[Owner],
+    tables: Sequence[TableSpec],
+    workers: int = 1,
+    batch_size: int = 10000,
+    force: bool = False,
+    verify: bool = False,
+    cache: bool = True,
+    daemon: bool = True,
+    definitions: bool = False,
+) -> int:
+    """
+    Re-extract the tables of the cases or scenario case links whose file hash
+    differs from the one their rows were extracted from, return the number of
+    rows inserted. With `definitions` set, cases whose table columns are
+    unchanged, e.g. when only their dispatch changed, are not rewritten, as
+    their rows already match the file. They only get their new file and
+    topology hashes recorded, as extracted.
+    """
+
+    with metrics.span("hash.files"):
+        file_hashes = {
+            fpath: get_hash(fpath, verify=verify)
+            for fpath in {owner.file_path for owner in owners}
+        }
+    changed = [
+        owner
+        for owner in owners
+        if force or owner.extracted_hash != file_hashes[owner.file_path]
+    ]
+
+    skipped = len(owners) - len(changed)
+    if skipped:
+        log.info(f"Skipping {skipped} unchanged file(s), use --force to re-extract.")
+
+    count = 0
+    unchanged = 0
+    hashes = file_hashes if cache else None
+    known_keys = base_key_files(changed, tables, file_hashes)
+    results = extract_owners(changed, tables, workers, hashes, daemon, known_keys)
+    for owner, snapshot in results:
+        if owner.file_path in known_keys:
+            keys = base_keys(tables, owner, snapshot)  # type: ignore
+        else:
+            keys = element_keys(tables, snapshot)
+        columns = table_columns(owner, tables, snapshot, keys)
+        owner_hashes = {
+            "md5_hash": file_hashes[owner.file_path],
+            "topology_hash": get_topology(tables, keys),
+        }
+
+        if definitions:
+            definition_hash = owner_hashes["definition_hash"] = get_definitions(columns)
+            if not force and owner.definition_hash == definition_hash:  # type: ignore
+                md5_hash = owner_hashes["md5_hash"]
+                db.update_columns(owner, {**owner_hashes, "extracted_hash": md5_hash})
+                unchanged += 1
+                continue
+
+        batches = extract_batches(tables, columns, batch_size=batch_size)
+        count += replace_rows(owner, tables, batches, owner_hashes)
+
+    if unchanged:
+        log.info(
+            f"Definitions of {unchanged} changed file(s) are unchanged, left their "
+            "rows in place, use --force to rewrite them."
+        )
+
+    if cache:
+        prune_unreferenced()
+
+    return count
+
+
+def prune_unreferenced() -> None:
+    """Delete the cached columns of case files no case or scenario refers to"""
+
+    with metrics.span("cache.prune"):
+        count, nbytes = prune_cache(keep=db.file_hashes())
+    if count:
+        log.info(
+            f"Pruned the cached columns of {count} replaced file(s), "
+            f"{format_bytes(nbytes)}."
+        )
+
+
+def log_summary(count: int, workers: int) -> None:
+    """Log the number of rows added and the peak memory usage"""
+
+    log.info(f"[green]Added {count} rows to the database.[/green]")
+    log.info(f"Peak memory usage: {format_bytes(get_peak_rss())}")
+    if workers > 1:
+        log.info(
+            f"Peak worker memory usage: {format_bytes(get_peak_rss(children=True))}"
+        )
 
 
 @app.command("case-data")
-def extract_case_data():
+def extract_case_data(
+    workers: Annotated[
+        int, typer.Option(min=1, help="Number of PSSE worker processes")
+    ] = 1,
+    batch_size: Annotated[
+        int, typer.Option(min=1, help="Number of rows inserted per commit")
+    ] = 10000,
+    force: Annotated[
+        bool, typer.Option(help="Re-extract files even if they are unchanged")
+    ] = False,
+    verify: Annotated[
+        bool, typer.Option(help="Re-hash files instead of using cached hashes")
+    ] = False,
+    cache: Annotated[
+        bool, typer.Option(help="Read and write the on-disk extraction cache")
+    ] = True,
+    daemon: Annotated[
+        bool, typer.Option(help="Extract through the PSSE daemon if it is running")
+    ] = True,
+):
     """Extract case data and insert into database"""
 
-    # TODO: Probably ask the factory for all extractor objects
-    creators = [
-        BusDefinitionObjExtractor,
-        BranchDefinitionObjExtractor,
-        MachineDefinitionObjExtractor,
-        TwoWindingTransformerDefinitionObjExtractor,
-    ]
     cases = db.select_table("case")
 
     if not cases:
@@ -287,67 +364,68 @@ def extract_case_data():
         return
 
     try:
-        objs = [
-            obj
-            for case in cases
-            for creator in creators
-            for obj in DefinitionObjExtractorFactory.create_extractor(creator).extract(
-                case  # type: ignore
-            )
-        ]
+        count = refresh_owners(
+            cases,  # type: ignore
+            DEFINITION_TABLES,
+            workers=workers,
+            batch_size=batch_size,
+            force=force,
+            verify=verify,
+            cache=cache,
+            daemon=daemon,
+            definitions=True,
+        )
 
     except Exception as e:
         log.error(f"An error occurred while extracting data: {e}")
         return
 
-    with db.session() as session:
-        try:
-            for obj in objs:
-                session.add(obj)
-            session.commit()
-        except Exception as e:
-            log.error(f"An error occurred while inserting data into the database: {e}")
-
-    log.info(f"[green]Added {len(objs)} rows to the database.[/green]")
+    log_summary(count, workers)
 
 
 @app.command("scenario-data")
-def extract_scenario_data():
+def extract_scenario_data(
+    workers: Annotated[
+        int, typer.Option(min=1, help="Number of PSSE worker processes")
+    ] = 1,
+    batch_size: Annotated[
+        int, typer.Option(min=1, help="Number of rows inserted per commit")
+    ] = 10000,
+    force: Annotated[
+        bool, typer.Option(help="Re-extract files even if they are unchanged")
+    ] = False,
+    verify: Annotated[
+        bool, typer.Option(help="Re-hash files instead of using cached hashes")
+    ] = False,
+    cache: Annotated[
+        bool, typer.Option(help="Read and write the on-disk extraction cache")
+    ] = True,
+    daemon: Annotated[
+        bool, typer.Option(help="Extract through the PSSE daemon if it is running")
+    ] = True,
+):
     """Extract scenario data and insert into database"""
 
-    creators = [
-        BusValuesObjExtractor,
-        BranchValuesObjExtractor,
-        MachineValuesObjExtractor,
-        TwoWindingTransformerValuesObjExtractor,
-    ]
-    session = db.session()
-    scenarios_case_links = db.select_table("scenariocaselink", session=session)
+    scenarios_case_links = db.select_table("scenariocaselink")
 
     if not scenarios_case_links:
         log.error("No scenario cases found in the database.")
         return
 
-    # TODO: seems like a lot of steps, refactor to smaller functions, introduce facade pattern
-    # TODO: need to delete existing data, or only refresh if the hash is different
-
     try:
-        objs = [
-            obj
-            for scenario_case_link in scenarios_case_links
-            for creator in creators
-            for obj in ValuesObjExtractorFactory.create_extractor(creator).extract(
-                scenario_case_link,  # type: ignore
-            )  # type: ignore
-        ]
-        session.close()
-
-        for obj in objs:
-            session.add(obj)
-        session.commit()
+        count = refresh_owners(
+            scenarios_case_links,  # type: ignore
+            VALUES_TABLES,
+            workers=workers,
+            batch_size=batch_size,
+            force=force,
+            verify=verify,
+            cache=cache,
+            daemon=daemon,
+        )
 
     except Exception as e:
         log.error(f"An error occurred while extracting data: {e}")
         return
 
-    log.info(f"[green]Added {len(objs)} rows to the database.[/green]")
+    log_summary(count, workers)
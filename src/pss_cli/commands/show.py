@@ -1,10 +1,10 @@
 import typer
 from typing import Optional
 from typing_extensions import Annotated
+from sqlalchemy.exc import DBAPIError
 
 from pss_cli.core.database import db
-from pss_cli.core.prompts import prompt_table_names
-from pss_cli.core.ui import print_models
+from pss_cli.core.ui import print_pages
 from pss_cli.core.logging import log
 
 
@@ -12,18 +12,54 @@ app = typer.Typer()
 
 
 @app.command(name="table")
-def get_table(name: Annotated[Optional[str], typer.Argument()] = None):
-    """Show table from database"""
+def get_table(
+    name: Annotated[Optional[str], typer.Argument()] = None,
+    where: Annotated[
+        Optional[str],
+        typer.Option(help='SQL filter, e.g. "case_id = 1 AND bus_number < 1000".'),
+    ] = None,
+    columns: Annotated[
+        Optional[str], typer.Option(help="Comma separated columns to show.")
+    ] = None,
+    order_by: Annotated[
+        Optional[str], typer.Option(help='SQL ordering, e.g. "bus_number DESC".')
+    ] = None,
+    limit: Annotated[
+        Optional[int], typer.Option(min=0, help="Maximum number of rows to show.")
+    ] = None,
+    offset: Annotated[int, typer.Option(min=0, help="Number of rows to skip.")] = 0,
+    page_size: Annotated[
+        Optional[int],
+        typer.Option(min=1, help="Rows per page, defaults to the terminal height."),
+    ] = None,
+):
+    """Show table from database, one page at a time"""
 
     if not name:
-        name = prompt_table_names()
+        from pss_cli.core.prompts import prompt_table_names
 
-    results = db.select_table(name)
+        name = prompt_table_names()
 
-    if not results:
-        log.error(f"Table '{name}' not found in the database")
-        return
+    column_names = (
+        [column.strip() for column in columns.split(",")] if columns else None
+    )
 
-    print_models(results)
-    # for result in results:
-    #     print_model(result)
+    try:
+        statement = db.select_statement(
+            name,
+            columns=column_names,
+            where=where,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+        )
+        print_pages(
+            name,
+            list(statement.selected_columns.keys()),
+            db.stream_rows(statement),
+            page_size=page_size,
+        )
+    except ValueError as e:
+        log.error(e)
+    except DBAPIError as e:
+        log.error(f"Invalid query: {e.orig}")
@@ -0,0 +1,160 @@
+import os
+import pathlib
+import shutil
+from collections import OrderedDict
+from typing import Container, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from pss_cli.core.config import CACHE_PATH
+from pss_cli.core.logging import log
+from pss_cli.core.snapshot import Columns
+
+# (file path, md5 hash, subsystem type, (key, attribute) pairs)
+TableKey = Tuple[str, str, str, Tuple[Tuple[str, str], ...]]
+
+
+def get_cache_dir(md5_hash: str, subsystem_type: str) -> pathlib.Path:
+    """Return the cache directory of a subsystem element type of a case file"""
+
+    return pathlib.Path(CACHE_PATH).joinpath(md5_hash, subsystem_type.lower())
+
+
+def load_columns(
+    md5_hash: str, subsystem_type: str, subsystem_info_mapper: Mapping[str, str]
+) -> Optional[Columns]:
+    """
+    Return the cached columns of a case file keyed on the mapper keys, memory
+    mapped from disk, or None if any attribute isn't cached
+    """
+
+    directory = get_cache_dir(md5_hash, subsystem_type)
+    columns = {}
+    for key, attribute in subsystem_info_mapper.items():
+        fpath = directory.joinpath(f"{attribute}.npy")
+        if not fpath.is_file():
+            return None
+        columns[key] = np.load(fpath, mmap_mode="r")
+
+    return columns
+
+
+def save_columns(
+    md5_hash: str,
+    subsystem_type: str,
+    subsystem_info_mapper: Mapping[str, str],
+    columns: Mapping[str, np.ndarray],
+) -> None:
+    """Cache the columns of a case file, one file per subsystem attribute"""
+
+    directory = get_cache_dir(md5_hash, subsystem_type)
+    os.makedirs(directory, exist_ok=True)
+
+    for key, attribute in subsystem_info_mapper.items():
+        fpath = directory.joinpath(f"{attribute}.npy")
+        tmp_path = directory.joinpath(f"{attribute}.tmp.npy")
+        np.save(tmp_path, np.asarray(columns[key]))
+        os.replace(tmp_path, fpath)
+
+
+def prune_cache(keep: Container[str] = ()) -> Tuple[int, int]:
+    """
+    Delete the cached columns of every case file whose md5 hash isn't in
+    `keep`, return the number of case files and bytes deleted. Directories
+    that can't be deleted, e.g. with a file still open on Windows, are logged
+    and left for the next prune.
+    """
+
+    root = pathlib.Path(CACHE_PATH)
+    if not root.is_dir():
+        return 0, 0
+
+    count = nbytes = 0
+    for directory in root.iterdir():
+        if not directory.is_dir() or directory.name in keep:
+            continue
+
+        size = sum(f.stat().st_size for f in directory.rglob("*") if f.is_file())
+        try:
+            shutil.rmtree(directory)
+        except OSError as e:
+            log.warning(f"Couldn't delete the cached columns in '{directory}': {e}")
+            continue
+
+        count += 1
+        nbytes += size
+
+    return count, nbytes
+
+
+def table_nbytes(columns: Mapping[str, np.ndarray]) -> int:
+    """Return the total size of a table's column arrays in bytes"""
+
+    return sum(column.nbytes for column in columns.values())
+
+
+class TableCache:
+    """
+    In-memory LRU of extracted element tables, evicting the least recently
+    used tables once their total size exceeds `budget` bytes. Cached arrays
+    are made read-only, as every caller shares them. Disabled with the
+    default budget of 0, as only a long lived process reads tables again.
+    """
+
+    def __init__(self, budget: int = 0):
+        self.budget = budget
+        self.tables: "OrderedDict[TableKey, Columns]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def get(self, key: TableKey) -> Optional[Columns]:
+        """Return a cached table, or None, counting the hit or miss"""
+
+        columns = self.tables.get(key)
+        if columns is None:
+            self.misses += 1
+            return None
+
+        self.tables.move_to_end(key)
+        self.hits += 1
+        return columns
+
+    def put(self, key: TableKey, columns: Mapping[str, np.ndarray]) -> None:
+        """Cache a table, evicting older tables to stay within the budget"""
+
+        size = table_nbytes(columns)
+        if not self.budget or size > self.budget:
+            return
+
+        if key in self.tables:
+            self.nbytes -= table_nbytes(self.tables.pop(key))
+
+        for column in columns.values():
+            column.setflags(write=False)
+        self.tables[key] = dict(columns)
+        self.nbytes += size
+
+        while self.nbytes > self.budget:
+            _, evicted = self.tables.popitem(last=False)
+            self.nbytes -= table_nbytes(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.tables.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters and the cache size"""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "tables": len(self.tables),
+            "nbytes": self.nbytes,
+        }
@@ -0,0 +1,86 @@
+from typing import Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from pss_cli.core.snapshot import Columns, num_rows
+
+
+class Comparison(NamedTuple):
+    keys: Columns
+    first: Columns
+    second: Columns
+    delta: Columns
+    percent: Columns
+    only_first: int
+    only_second: int
+
+
+def align(
+    first: Mapping[str, np.ndarray],
+    second: Mapping[str, np.ndarray],
+    keys: Sequence[str],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the indices of the elements of both sets of columns whose keys
+    match, in key order. Columns holding the same elements in the same order,
+    e.g. two scenarios of an unchanged topology, are aligned without a join.
+    """
+
+    if num_rows(first) == num_rows(second) and all(
+        np.array_equal(first[key], second[key]) for key in keys
+    ):
+        index = np.arange(num_rows(first))
+        return index, index
+
+    first_keys = np.rec.fromarrays([first[key] for key in keys], names=list(keys))
+    second_keys = np.rec.fromarrays([second[key] for key in keys], names=list(keys))
+    _, first_index, second_index = np.intersect1d(
+        first_keys, second_keys, assume_unique=True, return_indices=True
+    )
+
+    return first_index, second_index
+
+
+def percent_change(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Return the change from first to second in percent, NaN where first is 0"""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(first != 0, (second - first) / np.abs(first) * 100, np.nan)
+
+
+def compare_columns(
+    first: Mapping[str, np.ndarray],
+    second: Mapping[str, np.ndarray],
+    keys: Sequence[str],
+    quantities: Sequence[str],
+) -> Comparison:
+    """
+    Align two sets of element values on their keys and return the values of
+    both, their deltas and percent changes for the elements in both
+    """
+
+    first_index, second_index = align(first, second, keys)
+    a = {name: first[name][first_index] for name in quantities}
+    b = {name: second[name][second_index] for name in quantities}
+
+    return Comparison(
+        keys={key: first[key][first_index] for key in keys},
+        first=a,
+        second=b,
+        delta={name: b[name] - a[name] for name in quantities},
+        percent={name: percent_change(a[name], b[name]) for name in quantities},
+        only_first=num_rows(first) - len(first_index),
+        only_second=num_rows(second) - len(second_index),
+    )
+
+
+def top_movers(delta: np.ndarray, count: int) -> np.ndarray:
+    """Return the indices of the `count` largest absolute deltas, largest first"""
+
+    magnitude = np.nan_to_num(np.abs(delta), nan=-1.0)
+    if count < len(magnitude):
+        index = np.argpartition(magnitude, -count)[-count:]
+    else:
+        index = np.arange(len(magnitude))
+
+    return index[np.argsort(magnitude[index])[::-1]]
@@ -1 +1,26 @@
 SCENARIO_PATH = "./.pss_cli_data/scenarios"
+CACHE_PATH = "./.pss_cli_data/cache"
+DAEMON_PATH = "./.pss_cli_data/daemon"
+PROFILE_PATH = "./.pss_cli_data/profiles"
+
+# Environment variable switching PsseAPI to the NumPy backed fake psspy of
+# pss_cli.psse.fake, to run and load test the CLI without PSSE
+FAKE_PSSE_ENV = "PSS_CLI_FAKE_PSSE"
+
+# Memory budget of the PSSE daemon's in-memory LRU of extracted element
+# tables, in bytes. One-shot commands and pool workers exit before reading a
+# table twice, so keep none.
+TABLE_CACHE_BUDGET = 512 * 1024 * 1024
+
+# PRAGMAs applied to every new SQLite connection, selected by SQLITE_PROFILE
+SQLITE_PROFILES = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # negative values are in KiB, i.e. 64 MB
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+SQLITE_PROFILE = "performance"
@@ -1,15 +1,53 @@
-from typing import List, Optional, Sequence, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    Union,
+)
+
+import numpy as np
 from sqlmodel import SQLModel, Session, select, create_engine
-from sqlalchemy import ColumnElement
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Engine,
+    Inspector,
+    Row,
+    Select,
+    Table,
+    and_,
+    event,
+    insert,
+    inspect,
+    text,
+    update,
+)
+from sqlalchemy.schema import CreateTable
 
+from pss_cli.core.cache import table_nbytes
+from pss_cli.core.config import SQLITE_PROFILE, SQLITE_PROFILES
 from pss_cli.core.logging import log
-from pss_cli.core.models import Case
+from pss_cli.core.metrics import metrics
+from pss_cli.core.models import Case, ScenarioCaseLink
+from pss_cli.core.snapshot import num_rows, slice_columns
+
+# Bump on every model change, so existing databases are brought up to date
+SCHEMA_VERSION = 3
 
 
 class Database:
-    def __init__(self, sqlite_filename: str):
+    def __init__(self, sqlite_filename: str, profile: str = SQLITE_PROFILE):
         sqlite_url = f"sqlite:///{sqlite_filename}"
         self.engine = create_engine(sqlite_url)
+        self.pragmas = SQLITE_PROFILES[profile]
+        set_pragmas(self.engine, self.pragmas)
 
     def get_all_table_names(self) -> List[str]:
         """Return a list of all table names"""
@@ -24,7 +62,93 @@ class Database:
         return tables_dict.get(table_name)
 
     def create_db_and_tables(self):
+        version = self.get_schema_version()
         SQLModel.metadata.create_all(bind=self.engine)
+        if version < SCHEMA_VERSION:
+            self.rebuild_changed_tables()
+        self.add_missing_columns()
+        self.add_missing_indexes()
+        if version != SCHEMA_VERSION:
+            self.set_schema_version(SCHEMA_VERSION)
+
+    def create_db_if_changed(self) -> None:
+        """Create or update the tables only if the schema version changed"""
+
+        if self.get_schema_version() != SCHEMA_VERSION:
+            self.create_db_and_tables()
+
+    def get_schema_version(self) -> int:
+        """Return the schema version stored in the database file"""
+
+        with self.engine.connect() as connection:
+            return connection.execute(text("PRAGMA user_version")).scalar_one()
+
+    def set_schema_version(self, version: int) -> None:
+        """Store the schema version in the database file"""
+
+        with self.engine.begin() as connection:
+            connection.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+    def rebuild_changed_tables(self) -> None:
+        """
+        Rebuild tables whose primary or foreign keys differ from the models,
+        copying their rows across, as SQLite can't alter keys in place
+        """
+
+        inspector = inspect(self.engine)
+        changed = [
+            table
+            for table in SQLModel.metadata.sorted_tables
+            if keys_changed(inspector, table)
+        ]
+        if not changed:
+            return
+
+        with self.engine.begin() as connection:
+            for table in changed:
+                existing = {
+                    column["name"] for column in inspector.get_columns(table.name)
+                }
+                log.info(f"Rebuilding table '{table.name}' with new keys")
+                rebuild_table(connection, table, existing)
+
+    def add_missing_columns(self) -> None:
+        """Add nullable model columns that are missing from existing tables"""
+
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in SQLModel.metadata.sorted_tables:
+                existing = {
+                    column["name"] for column in inspector.get_columns(table.name)
+                }
+                for column in table.columns:
+                    if column.name in existing or not column.nullable:
+                        continue
+
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    log.info(f"Adding column '{column.name}' to table '{table.name}'")
+                    connection.execute(
+                        text(
+                            f'ALTER TABLE "{table.name}" '
+                            f'ADD COLUMN "{column.name}" {column_type}'
+                        )
+                    )
+
+    def add_missing_indexes(self) -> None:
+        """Create model indexes that are missing from existing tables"""
+
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in SQLModel.metadata.sorted_tables:
+                existing = {
+                    index["name"] for index in inspector.get_indexes(table.name)
+                }
+                for index in table.indexes:
+                    if index.name in existing:
+                        continue
+
+                    log.info(f"Adding index '{index.name}' to table '{table.name}'")
+                    index.create(bind=connection)
 
     def select_table(
         self,
@@ -39,17 +163,136 @@ class Database:
         if where is not None:
             statement = statement.where(where)
 
-        if not session:
-            with self.session() as session:
+        with metrics.span("db.select") as span:
+            if not session:
+                with self.session() as session:
+                    results = session.exec(statement).all()
+            else:
                 results = session.exec(statement).all()
-        else:
-            results = session.exec(statement).all()
+            span.add(rows=len(results))
 
         if None in results:
             return None
 
         return results
 
+    def select_statement(
+        self,
+        table_name: str,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[str] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        join: Optional[str] = None,
+    ) -> Select:
+        """
+        Return a select of `columns` (all by default) from a table, with the
+        `where` and `order_by` SQL clauses, `limit` and `offset` applied in SQL.
+        A `join` table is joined on the table's foreign key to it, adding the
+        columns that the table doesn't already have.
+        """
+
+        table = SQLModel.metadata.tables.get(table_name)
+        if table is None:
+            raise ValueError(f"Table '{table_name}' not found in the database")
+
+        source: Any = table
+        if join:
+            joined = SQLModel.metadata.tables.get(join)
+            if joined is None:
+                raise ValueError(f"Table '{join}' not found in the database")
+
+            constraint = next(
+                (
+                    constraint
+                    for constraint in table.foreign_key_constraints
+                    if constraint.referred_table is joined
+                ),
+                None,
+            )
+            if constraint is None:
+                raise ValueError(f"Table '{table_name}' has no foreign key to '{join}'")
+
+            # Wrapped in a subquery so filters can use unqualified column names
+            on = and_(
+                *(element.parent == element.column for element in constraint.elements)
+            )
+            source = (
+                select(
+                    table,
+                    *(column for column in joined.c if column.name not in table.c),
+                )
+                .select_from(table.join(joined, on))
+                .subquery(table_name)
+            )
+
+        unknown = [column for column in columns or [] if column not in source.c]
+        if unknown:
+            raise ValueError(
+                f"Unknown column(s) in table '{table_name}': {', '.join(unknown)}"
+            )
+
+        if columns:
+            statement = select(*(source.c[column] for column in columns))
+        else:
+            statement = select(source)
+
+        if where:
+            statement = statement.where(text(where))
+        if order_by:
+            statement = statement.order_by(text(order_by))
+        if limit is not None:
+            statement = statement.limit(limit)
+        if offset:
+            statement = statement.offset(offset)
+
+        return statement
+
+    def stream_batches(
+        self, statement: Select, batch_size: int = 1000
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Yield the rows of a select statement in lists of up to `batch_size`
+        rows as they are fetched from the database, without creating model
+        instances
+        """
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(
+                statement
+            )
+            yield from result.partitions()
+
+    def stream_rows(self, statement: Select, batch_size: int = 1000) -> Iterator[Row]:
+        """Yield the rows of a select statement as they are fetched"""
+
+        for batch in self.stream_batches(statement, batch_size):
+            yield from batch
+
+    def select_columns(self, statement: Select) -> Dict[str, np.ndarray]:
+        """Return the result of a select statement as one array per column"""
+
+        compiled = statement.compile(self.engine)
+        parameters = [compiled.params[name] for name in compiled.positiontup or []]
+        with metrics.span("db.select") as span, self.engine.connect() as connection:
+            # The DBAPI cursor returns plain tuples, skipping a Row object per row
+            cursor = connection.connection.cursor()
+            cursor.execute(str(compiled), parameters)
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+            span.add(rows=len(rows))
+
+        values = list(zip(*rows)) or [()] * len(names)
+        return {name: np.array(column) for name, column in zip(names, values)}
+
+    def file_hashes(self) -> Set[str]:
+        """Return the md5 hashes of every case and scenario case file"""
+
+        statement = select(Case.md5_hash).union(select(ScenarioCaseLink.md5_hash))
+        with self.engine.connect() as connection:
+            return set(connection.execute(statement).scalars())
+
     def session(self):
         """Return a session object"""
         return Session(self.engine)
@@ -66,9 +309,132 @@ class Database:
         # print_model(obj)
         return obj
 
+    def bulk_insert_columns(
+        self,
+        table: Type[SQLModel],
+        columns: Mapping[str, np.ndarray],
+        chunk_size: int = 10000,
+        connection: Optional[Connection] = None,
+    ) -> int:
+        """
+        Insert columns of values into a table with executemany, in chunks of
+        `chunk_size` rows, without creating row dictionaries or model
+        instances. Runs in its own transaction unless a `connection` is given.
+        Returns the number of rows inserted.
+        """
+
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self.bulk_insert_columns(table, columns, chunk_size, connection)
+
+        names = ", ".join(f'"{name}"' for name in columns)
+        params = ", ".join("?" for _ in columns)
+        statement = f'INSERT INTO "{table.__tablename__}" ({names}) VALUES ({params})'
+
+        count = num_rows(columns)
+        with metrics.span("db.insert") as span:
+            for start in range(0, count, chunk_size):
+                chunk = slice_columns(columns, start, start + chunk_size)
+                rows = list(zip(*(column.tolist() for column in chunk.values())))
+                connection.exec_driver_sql(statement, rows)
+            span.add(rows=count, nbytes=table_nbytes(columns))
+
+        return count
+
+    def update_columns(
+        self,
+        obj: SQLModel,
+        values: Dict[str, Any],
+        connection: Optional[Connection] = None,
+    ) -> None:
+        """Update columns of the database row matching the primary key of `obj`"""
+
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self.update_columns(obj, values, connection)
+
+        table = type(obj)
+        where = and_(
+            *(
+                column == getattr(obj, column.key)
+                for column in inspect(table).primary_key
+            )
+        )
+        connection.execute(update(table).where(where).values(**values))
+
     def commit(self, session: Session):
         """Commit the session"""
-        session.commit()
+        with metrics.span("db.commit"):
+            session.commit()
+
+
+def keys_changed(inspector: Inspector, table: Table) -> bool:
+    """Return True if the table's keys in the database differ from the model"""
+
+    primary_key = inspector.get_pk_constraint(table.name)["constrained_columns"]
+    if set(primary_key) != {column.name for column in table.primary_key}:
+        return True
+
+    foreign_keys = {
+        (
+            tuple(foreign_key["constrained_columns"]),
+            foreign_key["referred_table"],
+            tuple(foreign_key["referred_columns"]),
+        )
+        for foreign_key in inspector.get_foreign_keys(table.name)
+    }
+    return foreign_keys != {
+        (
+            tuple(element.parent.name for element in constraint.elements),
+            constraint.referred_table.name,
+            tuple(element.column.name for element in constraint.elements),
+        )
+        for constraint in table.foreign_key_constraints
+    }
+
+
+def rebuild_table(connection: Connection, table: Table, existing: Iterable[str]):
+    """
+    Recreate `table` from its model, keeping the rows of its `existing`
+    columns. The new table is built under a temporary name and renamed once
+    the old one is dropped, so foreign keys in other tables keep pointing
+    at it. Indexes are left to `add_missing_indexes`.
+    """
+
+    preparer = connection.dialect.identifier_preparer
+    name = preparer.format_table(table)
+    tmp_name = preparer.quote(f"_new_{table.name}")
+
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect))
+    connection.exec_driver_sql(
+        ddl.replace(f"CREATE TABLE {name}", f"CREATE TABLE {tmp_name}", 1)
+    )
+
+    existing = set(existing)
+    columns = ", ".join(
+        preparer.quote(column.name)
+        for column in table.columns
+        if column.name in existing
+    )
+    connection.exec_driver_sql(
+        f"INSERT INTO {tmp_name} ({columns}) SELECT {columns} FROM {name}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {name}")
+    connection.exec_driver_sql(f"ALTER TABLE {tmp_name} RENAME TO {name}")
+
+
+def set_pragmas(engine: Engine, pragmas: Mapping[str, Any]) -> None:
+    """Apply `pragmas` to every new connection the engine opens"""
+
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
 
 
 db = Database(sqlite_filename="sqlite.db")
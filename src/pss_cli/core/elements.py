@@ -0,0 +1,277 @@
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+from sqlalchemy import ColumnElement, and_
+from sqlmodel import SQLModel
+
+from pss_cli.core.models import (
+    Case,
+    BusDefinition,
+    BranchDefinition,
+    MachineDefinition,
+    TwoWindingTransformerDefinition,
+    BusValues,
+    BranchValues,
+    MachineValues,
+    TwoWindingTransformerValues,
+    ScenarioCaseLink,
+)
+from pss_cli.core.snapshot import Columns, num_rows
+from pss_cli.psse.funcs.extract import SubsystemSpec
+
+Owner = Union[Case, ScenarioCaseLink]
+
+
+class FieldSpec(NamedTuple):
+    """A table column filled from a subsystem API attribute"""
+
+    column: str
+    attribute: str
+    convert: Optional[Callable[[np.ndarray], np.ndarray]] = None
+
+
+class TableSpec(NamedTuple):
+    """
+    An element table filled from one subsystem's attributes, with rows
+    identified by the `keys` fields. Values tables name the `definition`
+    table holding the same keys for their base case.
+    """
+
+    table: Type[SQLModel]
+    subsystem_type: str
+    keys: Tuple[FieldSpec, ...]
+    fields: Tuple[FieldSpec, ...]
+    definition: Optional[Type[SQLModel]] = None
+
+    @property
+    def name(self) -> str:
+        return str(self.table.__tablename__)
+
+    def key_columns(self, data: Columns) -> Columns:
+        """Return the key columns of a table of subsystem attributes"""
+
+        return convert_fields(self.keys, data)
+
+    def columns(self, owner: Owner, data: Columns, keys: Columns) -> Columns:
+        """
+        Return the table columns of a case or scenario case link from a
+        table of subsystem attributes and the element key columns
+        """
+
+        count = num_rows(keys)
+        return {
+            **{name: np.full(count, value) for name, value in owner_ids(owner).items()},
+            **keys,
+            **convert_fields(self.fields, data),
+        }
+
+    def where(self, owner: Owner) -> ColumnElement[bool]:
+        """Return a clause selecting the rows of a case or scenario case link"""
+
+        table = self.table.__table__  # type: ignore
+        return and_(
+            *(table.c[name] == value for name, value in owner_ids(owner).items())
+        )
+
+
+def owner_ids(owner: Owner) -> Dict[str, Optional[int]]:
+    """Return the id columns of the rows of a case or scenario case link"""
+
+    if isinstance(owner, ScenarioCaseLink):
+        return {"case_id": owner.case_id, "scenario_id": owner.scenario_id}
+
+    return {"case_id": owner.id}
+
+
+def convert_fields(fields: Iterable[FieldSpec], data: Columns) -> Columns:
+    """Return the columns of fields from a table of subsystem attributes"""
+
+    return {
+        field.column: (
+            field.convert(data[field.attribute])
+            if field.convert
+            else data[field.attribute]
+        )
+        for field in fields
+    }
+
+
+def subsystem_specs(
+    tables: Iterable[TableSpec], keys: bool = True
+) -> Dict[str, SubsystemSpec]:
+    """
+    Merge the attributes read for the tables into one spec per element type,
+    keyed on its subsystem type, so an element type is read in one subsystem
+    API call per attribute type however many tables it fills. Snapshot
+    columns are named after their attributes. With `keys` unset, the key
+    attributes are left out, for files whose keys are already known.
+    """
+
+    mappers: Dict[str, Dict[str, str]] = {}
+    for spec in tables:
+        fields = spec.keys + spec.fields if keys else spec.fields
+
+        mapper = mappers.setdefault(spec.subsystem_type, {})
+        mapper.update((field.attribute, field.attribute) for field in fields)
+
+    return {
+        subsystem_type: SubsystemSpec(subsystem_type, mapper)
+        for subsystem_type, mapper in mappers.items()
+    }
+
+
+BUS_KEY_FIELDS = (FieldSpec("bus_number", "NUMBER"),)
+
+BRANCH_KEY_FIELDS = (
+    FieldSpec("from_bus_number", "FROMNUMBER"),
+    FieldSpec("to_bus_number", "TONUMBER"),
+    FieldSpec("branch_id", "ID", np.char.strip),
+)
+
+MACHINE_KEY_FIELDS = (
+    FieldSpec("bus_number", "NUMBER"),
+    FieldSpec("machine_id", "ID", np.char.strip),
+)
+
+TWO_WINDING_TRANSFORMER_KEY_FIELDS = (
+    FieldSpec("from_bus_number", "FROMNUMBER"),
+    FieldSpec("to_bus_number", "TONUMBER"),
+    FieldSpec("branch_id", "ID", np.char.strip),
+)
+
+BUS_DEFINITION_TABLE = TableSpec(
+    table=BusDefinition,
+    subsystem_type="bus",
+    keys=BUS_KEY_FIELDS,
+    fields=(
+        FieldSpec("bus_name", "NAME", np.char.strip),
+        FieldSpec("bus_base_voltage", "BASE"),
+        FieldSpec("bus_type", "TYPE"),
+    ),
+)
+
+BRANCH_DEFINITION_TABLE = TableSpec(
+    table=BranchDefinition,
+    subsystem_type="brn",
+    keys=BRANCH_KEY_FIELDS,
+    fields=(
+        FieldSpec("from_bus_name", "FROMNAME", np.char.strip),
+        FieldSpec("to_bus_name", "TONAME", np.char.strip),
+        FieldSpec("pos_seq_r_pu", "RX", np.real),
+        FieldSpec("pos_seq_x_pu", "RX", np.imag),
+        FieldSpec("zero_seq_r_pu", "RXZERO", np.real),
+        FieldSpec("zero_seq_x_pu", "RXZERO", np.imag),
+        FieldSpec("pos_seq_b_pu", "CHARGING"),
+        FieldSpec("zero_seq_b_pu", "CHARGINGZERO"),
+    ),
+)
+
+MACHINE_DEFINITION_TABLE = TableSpec(
+    table=MachineDefinition,
+    subsystem_type="mach",
+    keys=MACHINE_KEY_FIELDS,
+    fields=(FieldSpec("machine_name", "NAME"),),
+)
+
+TWO_WINDING_TRANSFORMER_DEFINITION_TABLE = TableSpec(
+    table=TwoWindingTransformerDefinition,
+    subsystem_type="trn",
+    keys=TWO_WINDING_TRANSFORMER_KEY_FIELDS,
+    fields=(
+        FieldSpec("xfr_name", "XFRNAME"),
+        FieldSpec("pos_seq_r_pu", "RXNOM", np.real),
+        FieldSpec("pos_seq_x_pu", "RXNOM", np.imag),
+        FieldSpec("zero_seq_r_pu", "RXZERO", np.real),
+        FieldSpec("zero_seq_x_pu", "RXZERO", np.imag),
+        FieldSpec("vector_group", "VECTORGROUP"),
+        FieldSpec("controlled_bus_number", "ICONTNUMBER"),
+        FieldSpec("sbase_mva", "SBASE1"),
+        FieldSpec("rmax_pu", "RMAX"),
+        FieldSpec("rmin_pu", "RMIN"),
+        FieldSpec("vmax_pu", "VMAX"),
+        FieldSpec("vmin_pu", "VMIN"),
+    ),
+)
+
+BUS_VALUES_TABLE = TableSpec(
+    table=BusValues,
+    subsystem_type="bus",
+    keys=BUS_KEY_FIELDS,
+    fields=(
+        FieldSpec("bus_voltage_pu", "PU"),
+        FieldSpec("bus_voltage_kv", "KV"),
+        FieldSpec("bus_voltage_angle_deg", "ANGLED"),
+    ),
+    definition=BusDefinition,
+)
+
+BRANCH_VALUES_TABLE = TableSpec(
+    table=BranchValues,
+    subsystem_type="brn",
+    keys=BRANCH_KEY_FIELDS,
+    fields=(
+        FieldSpec("active_power_mw", "P"),
+        FieldSpec("reactive_power_mvar", "Q"),
+    ),
+    definition=BranchDefinition,
+)
+
+MACHINE_VALUES_TABLE = TableSpec(
+    table=MachineValues,
+    subsystem_type="mach",
+    keys=MACHINE_KEY_FIELDS,
+    fields=(
+        FieldSpec("mbase_mva", "MBASE"),
+        FieldSpec("active_power_mw", "PGEN"),
+        FieldSpec("reactive_power_mvar", "QGEN"),
+        FieldSpec("pmax", "PMAX"),
+        FieldSpec("pmin", "PMIN"),
+        FieldSpec("qmax", "QMAX"),
+        FieldSpec("qmin", "QMIN"),
+    ),
+    definition=MachineDefinition,
+)
+
+TWO_WINDING_TRANSFORMER_VALUES_TABLE = TableSpec(
+    table=TwoWindingTransformerValues,
+    subsystem_type="trn",
+    keys=TWO_WINDING_TRANSFORMER_KEY_FIELDS,
+    fields=(FieldSpec("ratio", "RATIO"),),
+    definition=TwoWindingTransformerDefinition,
+)
+
+DEFINITION_TABLES = (
+    BUS_DEFINITION_TABLE,
+    BRANCH_DEFINITION_TABLE,
+    MACHINE_DEFINITION_TABLE,
+    TWO_WINDING_TRANSFORMER_DEFINITION_TABLE,
+)
+
+VALUES_TABLES = (
+    BUS_VALUES_TABLE,
+    BRANCH_VALUES_TABLE,
+    MACHINE_VALUES_TABLE,
+    TWO_WINDING_TRANSFORMER_VALUES_TABLE,
+)
+
+# Table name -> spec of every element table filled from PSSE cases
+TABLES: Dict[str, TableSpec] = {
+    spec.name: spec for spec in (*DEFINITION_TABLES, *VALUES_TABLES)
+}
+
+# Element types and the prefix of their definitions and values tables
+ELEMENTS = {
+    "bus": "bus",
+    "branch": "branch",
+    "machine": "machine",
+    "transformer": "twowindingtransformer",
+}
@@ -0,0 +1,86 @@
+import csv
+import json
+from typing import Callable, Dict, Iterable, Sequence
+
+from sqlalchemy import ColumnElement, Row
+
+Batches = Iterable[Sequence[Row]]
+Writer = Callable[[str, Sequence[ColumnElement], Batches], int]
+
+
+def python_type(column: ColumnElement) -> type:
+    """Return the Python type of a column's values, str if it isn't known"""
+
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def write_csv(fpath: str, columns: Sequence[ColumnElement], batches: Batches) -> int:
+    """Write batches of rows to a CSV file with a header, return the row count"""
+
+    count = 0
+    with open(fpath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([column.name for column in columns])
+        for batch in batches:
+            writer.writerows(batch)
+            count += len(batch)
+
+    return count
+
+
+def write_jsonl(fpath: str, columns: Sequence[ColumnElement], batches: Batches) -> int:
+    """Write batches of rows to a JSON Lines file, one object per row"""
+
+    names = [column.name for column in columns]
+    count = 0
+    with open(fpath, "w") as f:
+        for batch in batches:
+            f.writelines(json.dumps(dict(zip(names, row))) + "\n" for row in batch)
+            count += len(batch)
+
+    return count
+
+
+def write_parquet(
+    fpath: str, columns: Sequence[ColumnElement], batches: Batches
+) -> int:
+    """
+    Write batches of rows to a Parquet file, one row group per batch, with
+    the schema taken from the column types. Requires pyarrow.
+    """
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow: 'pip install pyarrow'")
+
+    types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    schema = pa.schema(
+        [
+            (column.name, types.get(python_type(column), pa.string()))
+            for column in columns
+        ]
+    )
+
+    count = 0
+    with pq.ParquetWriter(fpath, schema) as writer:
+        for batch in batches:
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+
+    return count
+
+
+WRITERS: Dict[str, Writer] = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+}
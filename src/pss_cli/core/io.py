@@ -1 +1,170 @@
+import hashlib
+import os
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    TextColumn,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
+
+from pss_cli.core.logging import log
+
+CHUNK_SIZE = 1024 * 1024
+FICLONE = 0x40049409  # Linux ioctl to share extents with another file
+
+Advance = Callable[[int], None]
+
+
+class ProvisionedFile(NamedTuple):
+    src: str
+    dst: str
+    method: str
+    size: int
+    md5_hash: Optional[str] = None  # None when the content is shared with src
+
+
+def _no_progress(num_bytes: int) -> None:
+    pass
+
+
+def reflink(src: str, dst: str) -> bool:
+    """Clone `src` to `dst` copy-on-write where the filesystem supports it"""
+
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            return False
+
+    return True
+
+
+def copy_range(src: str, dst: str, advance: Advance = _no_progress) -> bool:
+    """Copy `src` to `dst` in the kernel with copy_file_range where available"""
+
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    total = 0
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            while True:
+                copied = os.copy_file_range(  # type: ignore
+                    fsrc.fileno(), fdst.fileno(), 64 * CHUNK_SIZE
+                )
+                if not copied:
+                    break
+                total += copied
+                advance(copied)
+        except OSError:
+            advance(-total)
+            return False
+
+    return True
+
+
+def copy_and_hash(src: str, dst: str, advance: Advance = _no_progress) -> str:
+    """Copy `src` to `dst` and return the md5 hash computed from the same read"""
+
+    md5 = hashlib.md5()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        for chunk in iter(lambda: fsrc.read(CHUNK_SIZE), b""):
+            md5.update(chunk)
+            fdst.write(chunk)
+            advance(len(chunk))
+
+    return md5.hexdigest()
+
+
+def provision_file(
+    src: str, dst: str, hardlink: bool = False, advance: Advance = _no_progress
+) -> ProvisionedFile:
+    """
+    Provision `dst` as a copy of `src`, using the cheapest method available:
+    a hard link if requested, then a reflink, then copy_file_range, then a
+    buffered copy that hashes the data as it is copied.
+    """
+
+    size = os.path.getsize(src)
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    if hardlink:
+        os.link(src, dst)
+        advance(size)
+        return ProvisionedFile(src, dst, "hardlink", size)
+
+    if reflink(src, dst):
+        advance(size)
+        method = "reflink"
+    elif copy_range(src, dst, advance):
+        method = "copy_file_range"
+    else:
+        md5_hash = copy_and_hash(src, dst, advance)
+        shutil.copymode(src, dst)
+        return ProvisionedFile(src, dst, "copy", size, md5_hash)
+
+    shutil.copymode(src, dst)
+    return ProvisionedFile(src, dst, method, size)
+
+
+def provision_files(
+    pairs: Sequence[Tuple[str, str]], threads: int = 4, hardlink: bool = False
+) -> List[ProvisionedFile]:
+    """Provision (src, dst) file pairs in a thread pool, showing progress"""
+
+    total = sum(os.path.getsize(src) for src, _ in pairs)
+    columns = (
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+    )
+
+    start = time.perf_counter()
+    with Progress(*columns, transient=True) as progress:
+        task = progress.add_task("Provisioning files", total=total)
+
+        def advance(num_bytes: int) -> None:
+            progress.update(task, advance=num_bytes)
+
+        with ThreadPoolExecutor(max_workers=max(threads, 1)) as executor:
+            futures = [
+                executor.submit(provision_file, src, dst, hardlink, advance)
+                for src, dst in pairs
+            ]
+            provisioned = [future.result() for future in futures]
+
+    elapsed = time.perf_counter() - start
+    throughput = total / elapsed / 1e6 if elapsed else float("inf")
+    methods = ", ".join(sorted({file.method for file in provisioned}))
+    log.info(
+        f"Provisioned {len(provisioned)} file(s), {total / 1e6:.1f} MB in "
+        f"{elapsed:.2f} s ({throughput:.1f} MB/s) using {methods}."
+    )
+
+    return provisioned
+
+
+def break_hardlink(fpath: str) -> None:
+    """Replace a hard linked file with its own copy before it is modified"""
+
+    if not os.path.exists(fpath) or os.stat(fpath).st_nlink < 2:
+        return
+
+    tmp_path = f"{fpath}.tmp"
+    shutil.copy2(fpath, tmp_path)
+    os.replace(tmp_path, fpath)
@@ -0,0 +1,46 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+class LazyGroup(TyperGroup):
+    """
+    Typer group whose subcommands are only imported when they are invoked.
+
+    `lazy_subcommands` maps each subcommand name to the module holding its
+    Typer `app` and a static help string, so help listings don't import the
+    command modules (and through them PSSE, SQLAlchemy and InquirerPy).
+    """
+
+    lazy_subcommands: Dict[str, Tuple[str, str]] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return [*super().list_commands(ctx), *self.lazy_subcommands]
+
+    def get_command(self, ctx: click.Context, name: str) -> Optional[click.Command]:
+        if name not in self.lazy_subcommands:
+            return super().get_command(ctx, name)
+
+        # A placeholder with the static help is enough for help listings
+        return click.Group(name, help=self.lazy_subcommands[name][1])
+
+    def resolve_command(self, ctx: click.Context, args: List[str]):
+        name, command, args = super().resolve_command(ctx, args)
+        if name in self.lazy_subcommands:
+            command = self.load_command(name)
+
+        return name, command, args
+
+    def load_command(self, name: str) -> click.Command:
+        """Import a subcommand's module and return its click command"""
+
+        module_name, help = self.lazy_subcommands[name]
+        module = importlib.import_module(module_name)
+        command = typer.main.get_group(module.app)
+        command.name = name
+        command.help = command.help or help
+
+        return command
@@ -0,0 +1,175 @@
+import json
+import time
+from typing import Dict, List, Tuple
+
+from pss_cli.utils.memory import format_bytes
+
+
+class Stage:
+    """Accumulated calls, time, rows and bytes of one named stage"""
+
+    __slots__ = ("calls", "seconds", "rows", "nbytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.nbytes = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "rows": self.rows,
+            "bytes": self.nbytes,
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+class Span:
+    """Context manager adding its wall time and counts to a stage"""
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: Stage):
+        self.stage = stage
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stage.seconds += time.perf_counter() - self.start
+        self.stage.calls += 1
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        self.stage.rows += rows
+        self.stage.nbytes += nbytes
+
+
+class NullSpan:
+    """Span doing nothing, handed out while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Metrics:
+    """
+    Per-stage timings and counters of the current process. Disabled by
+    default, when spans are a shared no-op so instrumented code costs a
+    method call per span.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Stage] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.started = time.perf_counter()
+        self.stages.clear()
+
+    def span(self, name: str):
+        """Return a context manager timing a stage, see `Span.add` for counts"""
+
+        if not self.enabled:
+            return NULL_SPAN
+
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage()
+
+        return Span(stage)
+
+    def count(self, name: str, rows: int = 0, nbytes: int = 0) -> None:
+        """Count a call of a stage, with its rows and bytes, without timing it"""
+
+        if self.enabled:
+            stage = self.stages.setdefault(name, Stage())
+            stage.calls += 1
+            stage.rows += rows
+            stage.nbytes += nbytes
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def report(self) -> List[Tuple[str, ...]]:
+        """Return a formatted row per stage, slowest first"""
+
+        stages = sorted(self.stages.items(), key=lambda item: -item[1].seconds)
+        return [
+            (
+                name,
+                str(stage.calls),
+                f"{stage.seconds * 1e3:.1f}",
+                str(stage.rows) if stage.rows else "",
+                f"{stage.rows_per_second:,.0f}" if stage.rows and stage.seconds else "",
+                format_bytes(stage.nbytes) if stage.nbytes else "",
+            )
+            for name, stage in stages
+        ]
+
+    def write(self, fpath: str) -> None:
+        """Write the stages to a file, as JSON for .json files, else OpenMetrics"""
+
+        text = self.to_json() if fpath.endswith(".json") else self.to_openmetrics()
+        with open(fpath, "w") as f:
+            f.write(text)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "elapsed_seconds": self.elapsed,
+                "stages": {name: s.to_dict() for name, s in self.stages.items()},
+            },
+            indent=2,
+        )
+
+    def to_openmetrics(self, prefix: str = "pss_cli") -> str:
+        """Return the stages as OpenMetrics text, one counter family per field"""
+
+        families = {
+            "stage_calls": ("Number of calls of a stage", "calls"),
+            "stage_seconds": ("Time spent in a stage", "seconds"),
+            "stage_rows": ("Rows handled by a stage", "rows"),
+            "stage_bytes": ("Bytes handled by a stage", "nbytes"),
+        }
+
+        lines = []
+        for family, (help, field) in families.items():
+            lines += [
+                f"# TYPE {prefix}_{family} counter",
+                f"# HELP {prefix}_{family} {help}.",
+            ]
+            lines += [
+                f'{prefix}_{family}_total{{stage="{name}"}} {getattr(stage, field)}'
+                for name, stage in self.stages.items()
+            ]
+        lines += [
+            f"# TYPE {prefix}_elapsed_seconds gauge",
+            f"{prefix}_elapsed_seconds {self.elapsed}",
+            "# EOF",
+        ]
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from sqlalchemy import ForeignKeyConstraint
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -7,10 +8,12 @@ class ScenarioCaseLink(SQLModel, table=True):
         default=None, primary_key=True, foreign_key="scenario.id"
     )
     case_id: Optional[int] = Field(
-        default=None, primary_key=True, foreign_key="case.id"
+        default=None, primary_key=True, foreign_key="case.id", index=True
     )
     file_path: str
     md5_hash: str
+    extracted_hash: Optional[str] = None
+    topology_hash: Optional[str] = None
     case: "Case" = Relationship(back_populates="scenario_links")
     scenario: "Scenario" = Relationship(back_populates="case_links")
 
@@ -33,6 +36,9 @@ class Case(SQLModel, table=True):
     name: str
     file_path: str
     md5_hash: str
+    extracted_hash: Optional[str] = None
+    topology_hash: Optional[str] = None
+    definition_hash: Optional[str] = None
     description: Optional[str] = None
     rel_path: Optional[str] = None
     dynamic_files: List["CaseDynamicFile"] = Relationship(back_populates="case")
@@ -57,7 +63,7 @@ class CaseDynamicFile(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     file_path: str
     rel_path: Optional[str] = None
-    case_id: Optional[int] = Field(default=None, foreign_key="case.id")
+    case_id: Optional[int] = Field(default=None, foreign_key="case.id", index=True)
     case: "Case" = Relationship(back_populates="dynamic_files")
 
 
@@ -67,7 +73,7 @@ class GeneratingSystem(SQLModel, table=True):
     from_bus: int
     to_bus: int
     reversed: bool = Field(default=False)
-    case_id: Optional[int] = Field(default=None, foreign_key="case.id")
+    case_id: Optional[int] = Field(default=None, foreign_key="case.id", index=True)
     case: "Case" = Relationship(back_populates="generating_systems")
     generators: List["Generator"] = Relationship(back_populates="generating_systems")
     setpoints: "GeneratingSystemSetpoint" = Relationship(
@@ -80,7 +86,7 @@ class Generator(SQLModel, table=True):
     bus_number: int
     machine_id: str = "1"
     generating_system_id: Optional[int] = Field(
-        default=None, foreign_key="generatingsystem.id"
+        default=None, foreign_key="generatingsystem.id", index=True
     )
     generating_systems: "GeneratingSystem" = Relationship(back_populates="generators")
 
@@ -90,7 +96,7 @@ class InfGenerator(SQLModel, table=True):
     bus_number: int
     remote_bus_number: int
     machine_id: str = "1"
-    case_id: Optional[int] = Field(default=None, foreign_key="case.id")
+    case_id: Optional[int] = Field(default=None, foreign_key="case.id", index=True)
     case: "Case" = Relationship(back_populates="inf_generator")
     setpoint: "InfGeneratorSetpoint" = Relationship(back_populates="generator")
 
@@ -121,7 +127,9 @@ class InfGeneratorSetpoint(SQLModel, table=True):
 
 
 class BusDefinition(SQLModel, table=True):
-    case_id: Optional[int] = Field(foreign_key="case.id")
+    case_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="case.id"
+    )
     bus_number: int = Field(primary_key=True)
     bus_name: str
     bus_base_voltage: float
@@ -130,7 +138,9 @@ class BusDefinition(SQLModel, table=True):
 
 
 class BranchDefinition(SQLModel, table=True):
-    case_id: Optional[int] = Field(foreign_key="case.id")
+    case_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="case.id"
+    )
     from_bus_number: int = Field(primary_key=True)
     to_bus_number: int = Field(primary_key=True)
     branch_id: str = Field(primary_key=True)
@@ -146,7 +156,9 @@ class BranchDefinition(SQLModel, table=True):
 
 
 class MachineDefinition(SQLModel, table=True):
-    case_id: Optional[int] = Field(foreign_key="case.id")
+    case_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="case.id"
+    )
     bus_number: int = Field(primary_key=True)
     machine_id: str = Field(primary_key=True)
     machine_name: str
@@ -154,7 +166,9 @@ class MachineDefinition(SQLModel, table=True):
 
 
 class TwoWindingTransformerDefinition(SQLModel, table=True):
-    case_id: Optional[int] = Field(foreign_key="case.id")
+    case_id: Optional[int] = Field(
+        default=None, primary_key=True, foreign_key="case.id"
+    )
     from_bus_number: int = Field(primary_key=True)
     to_bus_number: int = Field(primary_key=True)
     branch_id: str = Field(primary_key=True)
@@ -174,9 +188,18 @@ class TwoWindingTransformerDefinition(SQLModel, table=True):
 
 
 class BusValues(SQLModel, table=True):
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["case_id", "bus_number"],
+            ["busdefinition.case_id", "busdefinition.bus_number"],
+        ),
+    )
+
     case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
-    scenario_id: Optional[int] = Field(primary_key=True, foreign_key="scenario.id")
-    bus_number: int = Field(primary_key=True, foreign_key="busdefinition.bus_number")
+    scenario_id: Optional[int] = Field(
+        primary_key=True, foreign_key="scenario.id", index=True
+    )
+    bus_number: int = Field(primary_key=True)
     bus_voltage_pu: float
     bus_voltage_kv: float
     bus_voltage_angle_deg: float
@@ -185,15 +208,25 @@ class BusValues(SQLModel, table=True):
 
 
 class BranchValues(SQLModel, table=True):
-    case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
-    scenario_id: Optional[int] = Field(primary_key=True, foreign_key="scenario.id")
-    from_bus_number: int = Field(
-        primary_key=True, foreign_key="branchdefinition.from_bus_number"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["case_id", "from_bus_number", "to_bus_number", "branch_id"],
+            [
+                "branchdefinition.case_id",
+                "branchdefinition.from_bus_number",
+                "branchdefinition.to_bus_number",
+                "branchdefinition.branch_id",
+            ],
+        ),
     )
-    to_bus_number: int = Field(
-        primary_key=True, foreign_key="branchdefinition.to_bus_number"
+
+    case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
+    scenario_id: Optional[int] = Field(
+        primary_key=True, foreign_key="scenario.id", index=True
     )
-    branch_id: str = Field(primary_key=True, foreign_key="branchdefinition.branch_id")
+    from_bus_number: int = Field(primary_key=True)
+    to_bus_number: int = Field(primary_key=True)
+    branch_id: str = Field(primary_key=True)
     active_power_mw: float
     reactive_power_mvar: float
     case: "Case" = Relationship(back_populates="branch_values")
@@ -201,8 +234,21 @@ class BranchValues(SQLModel, table=True):
 
 
 class MachineValues(SQLModel, table=True):
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["case_id", "bus_number", "machine_id"],
+            [
+                "machinedefinition.case_id",
+                "machinedefinition.bus_number",
+                "machinedefinition.machine_id",
+            ],
+        ),
+    )
+
     case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
-    scenario_id: Optional[int] = Field(primary_key=True, foreign_key="scenario.id")
+    scenario_id: Optional[int] = Field(
+        primary_key=True, foreign_key="scenario.id", index=True
+    )
     bus_number: int = Field(primary_key=True)
     machine_id: str = Field(primary_key=True)
     mbase_mva: float
@@ -217,17 +263,33 @@ class MachineValues(SQLModel, table=True):
 
 
 class TwoWindingTransformerValues(SQLModel, table=True):
-    case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
-    scenario_id: Optional[int] = Field(primary_key=True, foreign_key="scenario.id")
-    from_bus_number: int = Field(
-        primary_key=True, foreign_key="twowindingtransformerdefinition.from_bus_number"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["case_id", "from_bus_number", "to_bus_number", "branch_id"],
+            [
+                "twowindingtransformerdefinition.case_id",
+                "twowindingtransformerdefinition.from_bus_number",
+                "twowindingtransformerdefinition.to_bus_number",
+                "twowindingtransformerdefinition.branch_id",
+            ],
+        ),
     )
-    to_bus_number: int = Field(
-        primary_key=True, foreign_key="twowindingtransformerdefinition.to_bus_number"
-    )
-    branch_id: str = Field(
-        primary_key=True, foreign_key="twowindingtransformerdefinition.branch_id"
+
+    case_id: Optional[int] = Field(primary_key=True, foreign_key="case.id")
+    scenario_id: Optional[int] = Field(
+        primary_key=True, foreign_key="scenario.id", index=True
     )
+    from_bus_number: int = Field(primary_key=True)
+    to_bus_number: int = Field(primary_key=True)
+    branch_id: str = Field(primary_key=True)
     ratio: float
     case: "Case" = Relationship(back_populates="two_winding_transformer_values")
     scenario: "Scenario" = Relationship(back_populates="two_winding_transformer_values")
+
+
+class FileHash(SQLModel, table=True):
+    file_path: str = Field(primary_key=True)
+    size: int
+    mtime_ns: int
+    inode: int
+    md5_hash: str
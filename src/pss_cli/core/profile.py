@@ -0,0 +1,119 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Iterator, List
+
+from pss_cli.core.config import PROFILE_PATH
+
+# Number of entries in the text summaries
+PROFILE_TOP = 40
+
+
+class Profiler(str, Enum):
+    cprofile = "cprofile"
+    tracemalloc = "tracemalloc"
+
+
+def command_name(args: List[str]) -> str:
+    """
+    Return a file name safe name of the command in `args`, from its leading
+    words up to the subcommand, e.g. extract-case-data
+    """
+
+    words = []
+    for arg in args:
+        if arg.startswith("-") or len(words) == 2:
+            break
+        words.append(re.sub(r"[^\w.-]", "_", arg))
+
+    return "-".join(words) or "pss_cli"
+
+
+@contextmanager
+def profile(profiler: Profiler, name: Callable[[], str]) -> Iterator[None]:
+    """
+    Profile the block, writing the results to files in PROFILE_PATH named
+    after the command, as returned by `name` once the block has run, and the
+    time it started
+    """
+
+    started = time.strftime("%Y%m%d-%H%M%S")
+
+    def get_stem() -> str:
+        os.makedirs(PROFILE_PATH, exist_ok=True)
+        return os.path.join(PROFILE_PATH, f"{name()}-{started}")
+
+    if profiler == Profiler.cprofile:
+        with profile_calls(get_stem):
+            yield
+    else:
+        with profile_allocations(get_stem):
+            yield
+
+
+@contextmanager
+def profile_calls(get_stem: Callable[[], str]) -> Iterator[None]:
+    """
+    Run the block under cProfile, writing the stats to <stem>.prof (for
+    snakeviz or pstats) and summaries sorted by cumulative and own time to
+    <stem>.txt
+    """
+
+    import cProfile
+    import pstats
+
+    from pss_cli.core.logging import log
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stem = get_stem()
+        profiler.dump_stats(f"{stem}.prof")
+        with open(f"{stem}.txt", "w") as f:
+            stats = pstats.Stats(profiler, stream=f)
+            stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP)
+            stats.sort_stats("tottime").print_stats(PROFILE_TOP)
+
+        log.info(f"Wrote cProfile stats to '{stem}.prof' and '{stem}.txt'.")
+
+
+@contextmanager
+def profile_allocations(get_stem: Callable[[], str]) -> Iterator[None]:
+    """
+    Trace memory allocations in the block with tracemalloc, writing the peak
+    and the top allocation sites still held at its end to <stem>.txt
+    """
+
+    import tracemalloc
+
+    from pss_cli.core.logging import log
+    from pss_cli.utils.memory import format_bytes
+
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stem = get_stem()
+        sites = snapshot.statistics("lineno")[:PROFILE_TOP]
+        with open(f"{stem}.txt", "w") as f:
+            f.write(f"Peak traced memory: {format_bytes(peak)}\n")
+            f.write(f"Traced memory at exit: {format_bytes(current)}\n\n")
+            f.write(f"Top {len(sites)} allocation sites:\n")
+            for site in sites:
+                f.write(f"{site}\n")
+
+        log.info(
+            f"Peak traced memory: {format_bytes(peak)}, wrote the top allocation "
+            f"sites to '{stem}.txt'."
+        )
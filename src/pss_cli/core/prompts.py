@@ -2,6 +2,7 @@ from typing import List, Optional, Sequence, Union
 from pathlib import Path
 from InquirerPy.base.control import Choice
 from InquirerPy.inquirer import fuzzy, checkbox
+from sqlalchemy import ColumnElement
 from sqlmodel import SQLModel
 from functools import partial
 
@@ -52,11 +53,13 @@ def prompt_case_path(root_dir: str, match_pattern: str):
 
 
 def prompt_select_table(
-    table_name: str, parameters: Optional[Union[str, List[str]]]
+    table_name: str,
+    parameters: Optional[Union[str, List[str]]],
+    where: Optional[ColumnElement[bool]] = None,
 ) -> SQLModel:
     """Return a checkbox selection of table rows from the database"""
 
-    objects = db.select_table(table_name)
+    objects = db.select_table(table_name, where=where)
 
     transformer = None
     if parameters and isinstance(parameters, str):
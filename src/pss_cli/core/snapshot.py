@@ -0,0 +1,127 @@
+import hashlib
+from typing import Dict, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+
+Columns = Dict[str, np.ndarray]
+
+
+class CaseSnapshot:
+    """
+    Columnar snapshot of a case, holding each element table as one NumPy
+    array per column instead of one Python object per element.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, Columns]] = None):
+        self.tables: Dict[str, Columns] = tables or {}
+
+    def __getitem__(self, name: str) -> Columns:
+        return self.tables[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.tables
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tables)
+
+    def add_table(self, name: str, columns: Mapping[str, Sequence]) -> Columns:
+        """Add an element table, converting each column to an array"""
+
+        self.tables[name] = {key: np.asarray(value) for key, value in columns.items()}
+        return self.tables[name]
+
+    def num_rows(self, name: str) -> int:
+        """Return the number of rows in an element table"""
+
+        return num_rows(self.tables[name])
+
+    @property
+    def nbytes(self) -> int:
+        """Return the total size of all column arrays in bytes"""
+
+        return sum(
+            column.nbytes
+            for columns in self.tables.values()
+            for column in columns.values()
+        )
+
+
+def num_rows(columns: Mapping[str, np.ndarray]) -> int:
+    """Return the number of rows in a set of equal length columns"""
+
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def slice_columns(columns: Mapping[str, np.ndarray], start: int, stop: int) -> Columns:
+    """Return a view of rows `start` to `stop` of every column"""
+
+    return {key: value[start:stop] for key, value in columns.items()}
+
+
+# Odd 64 bit constant mixing each key column into the element hashes
+KEY_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def key_hashes(columns: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Return one 64 bit hash per element of its key columns. String keys are
+    stripped and hashed from their character codes, so padding doesn't count.
+    """
+
+    hashes = np.zeros(len(columns[0]), dtype=np.uint64)
+    for column in columns:
+        if column.dtype.kind == "U":
+            codes = (
+                np.ascontiguousarray(np.char.strip(column))
+                .view(np.uint32)
+                .reshape(len(column), column.dtype.itemsize // 4)
+                .astype(np.uint64)
+            )
+            weights = np.cumprod(
+                np.full(codes.shape[1], KEY_HASH_MULTIPLIER, dtype=np.uint64)
+            )
+            values = (codes * weights).sum(axis=1, dtype=np.uint64)
+        else:
+            values = column.astype(np.int64).view(np.uint64)
+
+        hashes = (hashes ^ values) * KEY_HASH_MULTIPLIER
+        hashes ^= hashes >> np.uint64(31)
+
+    return hashes
+
+
+def topology_fingerprint(tables: Mapping[str, Mapping[str, np.ndarray]]) -> str:
+    """
+    Return a hash of the element key columns of each table, e.g. bus numbers
+    and branch ends and ids. It hashes the sorted per-element key hashes, so
+    it only changes when elements are added, removed or renumbered, not when
+    they are reordered or their values change.
+    """
+
+    md5 = hashlib.md5()
+    for name in sorted(tables):
+        names = sorted(tables[name])
+        hashes = key_hashes([np.asarray(tables[name][key]) for key in names])
+        md5.update(f"{name}:{','.join(names)}:{len(hashes)}".encode())
+        md5.update(np.sort(hashes).tobytes())
+
+    return md5.hexdigest()
+
+
+def columns_fingerprint(tables: Mapping[str, Mapping[str, np.ndarray]]) -> str:
+    """
+    Return a hash of the content of every column of each table, in row order,
+    so unlike the topology fingerprint it changes when any value changes or
+    elements are reordered
+    """
+
+    md5 = hashlib.md5()
+    for name in sorted(tables):
+        for key in sorted(tables[name]):
+            column = np.asarray(tables[name][key])
+            if column.dtype.kind == "O":
+                column = column.astype(str)
+            md5.update(f"{name}.{key}:{column.dtype.str}:{len(column)}".encode())
+            md5.update(np.ascontiguousarray(column).tobytes())
+
+    return md5.hexdigest()
@@ -1,4 +1,5 @@
-from typing import List, Sequence, Union
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Sequence, Union
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
@@ -44,3 +45,56 @@ def print_models(models: Sequence[Union[SQLModel, None]]):
         table.add_row(*values)
 
     console.print(table)
+
+
+def print_pages(
+    title: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    page_size: Optional[int] = None,
+) -> int:
+    """
+    Print rows as a table one page at a time, as they arrive. On a terminal,
+    each page fills the screen and the next one is only fetched and printed
+    after <enter>, with no prompt after the last page. Returns the number of
+    rows printed.
+    """
+
+    console = Console()
+    interactive = console.is_terminal
+    if page_size is None:
+        page_size = max(console.height - 8, 1) if interactive else 1000
+
+    # Each page is read with one row ahead, held back for the next page, so
+    # the prompt only shows when there are more rows
+    iterator = iter(rows)
+    page = list(islice(iterator, page_size + 1))
+    count = 0
+    while page:
+        table = Table(title=title, show_lines=False)
+        for column in columns:
+            table.add_column(column)
+
+        for row in page[:page_size]:
+            table.add_row(*(str(value) for value in row))
+
+        console.print(table)
+        count += min(len(page), page_size)
+        if len(page) <= page_size:
+            break
+
+        if interactive:
+            response = console.input(
+                f"[grey66]Showing rows 1-{count}. "
+                "Press <enter> for the next page or q to quit: [/grey66]"
+            )
+            if response.strip().lower() == "q":
+                break
+
+        # Fetched after the prompt, so quitting doesn't read another page
+        page = page[page_size:] + list(islice(iterator, page_size))
+
+    if not count:
+        console.print("No results to show.")
+
+    return count
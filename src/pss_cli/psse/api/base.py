@@ -1,11 +1,29 @@
-from pydantic import BaseModel
-import pssepath
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
 
+from pydantic import BaseModel, PrivateAttr
+
+from pss_cli.core.cache import TableCache
+from pss_cli.core.config import FAKE_PSSE_ENV
+from pss_cli.core.io import break_hardlink
+from pss_cli.core.metrics import metrics
 from pss_cli.utils.silence import SilenceStdout
 
-pssepath.add_pssepath()
+# A psspy module registered ahead of time (e.g. a stub in tests) is used as-is
+if "psspy" not in sys.modules and os.environ.get(FAKE_PSSE_ENV):
+    from pss_cli.psse.fake import psspy as fake_psspy
+
+    sys.modules["psspy"] = fake_psspy
+
+if "psspy" not in sys.modules:
+    import pssepath
+
+    pssepath.add_pssepath()
+
+    import psse34  # noqa: F401, E402  # type: ignore
 
-import psse34  # noqa: F401, E402  # type: ignore
 import psspy  # noqa: E402  # type: ignore
 
 from pss_cli.psse.api.case_data import PsseCaseDataMixin  # noqa: E402
@@ -13,25 +31,66 @@ from pss_cli.psse.api.case_data import PsseCaseDataMixin  # noqa: E402
 
 class PsseAPI(PsseCaseDataMixin, BaseModel):
     initialised: bool = False
+    loaded_case: Optional[str] = None
+    loaded_stat: Optional[Tuple[int, int, int]] = None
+    load_count: int = 0
+    _tables: TableCache = PrivateAttr(default_factory=TableCache)
 
     def __post_init__(self):
         self.initialised = False
 
+    @property
+    def tables(self) -> TableCache:
+        """LRU of element tables extracted by this instance"""
+        return self._tables
+
     def initialise(self, num_busses: int = 200000) -> None:
         """Initialise PSSE"""
 
         if not self.initialised:
-            with SilenceStdout():
+            with SilenceStdout(), metrics.span("psspy.psseinit"):
                 psspy.psseinit(num_busses)
             self.initialised = True
 
     def load_case(self, fpath: str) -> None:
         """Load a PSSE case from disk"""
-        psspy.case(fpath)
+        stat = file_stat(fpath)
+        with metrics.span("psspy.case"):
+            psspy.case(fpath)
+        self.loaded_case = os.path.abspath(fpath)
+        self.loaded_stat = stat
+        self.load_count += 1
 
     def save_case(self, fpath: str) -> None:
         """Save the loaded PSSE case to disk"""
-        psspy.save(fpath)
+        break_hardlink(fpath)
+        with metrics.span("psspy.save"):
+            psspy.save(fpath)
+        if os.path.abspath(fpath) == self.loaded_case:
+            self.loaded_stat = file_stat(fpath)
+
+    @contextmanager
+    def case_session(self, fpath: str, reload: bool = False) -> Iterator["PsseAPI"]:
+        """
+        Make `fpath` the loaded case, only loading it if it isn't loaded
+        already or its file changed since it was loaded
+        """
+
+        self.initialise()
+        if (
+            reload
+            or self.loaded_case != os.path.abspath(fpath)
+            or self.loaded_stat != file_stat(fpath)
+        ):
+            self.load_case(fpath)
+        yield self
+
+
+def file_stat(fpath: str) -> Tuple[int, int, int]:
+    """Return the size, modification time and inode of a file"""
+
+    stat = os.stat(fpath)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
 
 
 api = PsseAPI()
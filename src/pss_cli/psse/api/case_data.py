@@ -1,12 +1,12 @@
-import typing
-from typing import List, Tuple
-from itertools import groupby
-from operator import itemgetter
+from typing import Dict, List, Sequence, Tuple
 from pydantic import BaseModel
 
 import psspy  # type: ignore
 
-attr_type = itemgetter(0)
+from pss_cli.core.metrics import metrics
+
+# Subsystem name -> attribute -> API type, these are fixed for a PSSE version
+_attribute_types: Dict[str, Dict[str, str]] = {}
 
 
 class PsseCaseDataMixin(BaseModel):
@@ -90,9 +90,21 @@ class PsseCaseDataMixin(BaseModel):
         sid [optional]: list only information for elements in this
             subsystem id (-1, all elements by default).
 
+        """
+        columns = self.subsystem_columns(name, attributes, sid, inservice)
+        return list(zip(*(columns[attribute] for attribute in attributes)))
+
+    def subsystem_columns(
+        self, name: str, attributes: List[str], sid: int = -1, inservice: bool = True
+    ) -> Dict[str, Sequence]:
+        """
+        Returns requested attributes from the PSS(r)E subsystem API as a
+        dictionary of attribute -> column, in the order requested, without
+        transposing them into rows. See `subsystem_info` for the arguments.
+
+        All attributes of the same type are fetched in a single API call.
         """
         name = name.lower()
-        gettypes = getattr(psspy, "a%stypes" % name)
         apilookup = {
             "I": getattr(psspy, "a%sint" % name),
             "R": getattr(psspy, "a%sreal" % name),
@@ -100,13 +112,34 @@ class PsseCaseDataMixin(BaseModel):
             "C": getattr(psspy, "a%schar" % name),
         }
 
-        result = []
-        ierr, attr_types = gettypes(attributes)
+        groups: Dict[str, List[str]] = {}
+        for attribute, attr_type in self.attribute_types(name, attributes).items():
+            groups.setdefault(attr_type, []).append(attribute)
+
+        fetched = {}
+        for attr_type, strings in groups.items():
+            func = apilookup[attr_type]
+            with metrics.span(f"psspy.a{name}") as span:
+                ierr, res = func(sid, flag=1 if inservice else 2, string=strings)
+                span.add(rows=len(res[0]) if res else 0)
+            fetched.update(zip(strings, res))
 
-        for k, group in groupby(zip(attr_types, attributes), key=attr_type):
-            func = apilookup[k]
-            strings = list(zip(*group))[1]
-            ierr, res = func(sid, flag=1 if inservice else 2, string=strings)
-            result.extend(res)
+        return {attribute: fetched[attribute] for attribute in attributes}
 
-        return list(zip(*result))
+    def attribute_types(self, name: str, attributes: List[str]) -> Dict[str, str]:
+        """Return the subsystem API type of each attribute, looked up once per subsystem"""
+
+        name = name.lower()
+        known = _attribute_types.setdefault(name, {})
+        unknown = [
+            attribute
+            for attribute in dict.fromkeys(attributes)
+            if attribute not in known
+        ]
+
+        if unknown:
+            gettypes = getattr(psspy, "a%stypes" % name)
+            ierr, attr_types = gettypes(unknown)
+            known.update(zip(unknown, attr_types))
+
+        return {attribute: known[attribute] for attribute in attributes}
@@ -0,0 +1,321 @@
+"""
+Seeded generator of synthetic PSSE networks for the fake psspy, so the CLI
+can be load tested without PSSE. Networks are saved as NumPy archives under
+any case file name:
+
+    python -m pss_cli.psse.fake.network case.sav --buses 60000 --seed 1
+    python -m pss_cli.psse.fake.network scen.sav --buses 60000 --seed 1 --dispatch-seed 2
+"""
+
+import argparse
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Subsystem (bus, brn, mach, trn, tr3, wnd) -> attribute -> column, in the
+# order psspy lists the elements
+Network = Dict[str, Dict[str, np.ndarray]]
+
+# Elements per bus, in the proportions of typical transmission models
+BRANCHES_PER_BUS = 1.2
+TRANSFORMERS_PER_BUS = 0.3
+THREE_WINDING_TRANSFORMERS_PER_BUS = 0.03
+MACHINES_PER_BUS = 0.15
+GENERATOR_BUSES_PER_MACHINE = 0.8
+
+# Share of isolated buses and of out of service branches and machines
+ISOLATED_BUSES = 0.005
+OUT_OF_SERVICE = 0.01
+
+# Branches connect buses at most this far apart in bus order, so the network
+# is meshed locally like a real one instead of being a random graph
+REACH = 50
+
+BASE_VOLTAGES = np.array([11.0, 33.0, 66.0, 132.0, 275.0, 400.0])
+MACHINE_BASES = np.array([25.0, 50.0, 100.0, 250.0, 500.0])
+TRANSFORMER_BASES = np.array([60.0, 120.0, 240.0, 500.0])
+
+# Largest bus number PSSE allows
+MAX_BUS_NUMBER = 999997
+
+
+def circuits(*columns: np.ndarray) -> np.ndarray:
+    """Return the 1-based occurrence of each row among rows with equal columns"""
+
+    order = np.lexsort(columns[::-1])
+    new = np.ones(len(order), dtype=bool)
+    new[1:] = np.any([c[order][1:] != c[order][:-1] for c in columns], axis=0)
+    start = np.maximum.accumulate(np.where(new, np.arange(len(order)), 0))
+
+    result = np.empty(len(order), dtype=np.int64)
+    result[order] = np.arange(len(order)) - start + 1
+    return result
+
+
+def pad(values: np.ndarray, width: int) -> np.ndarray:
+    """Return values as strings padded to `width` like psspy character data"""
+
+    return np.char.ljust(values.astype(str), width)
+
+
+def local_pairs(rng: np.random.Generator, count: int, buses: int) -> np.ndarray:
+    """Return `count` pairs of distinct bus indices at most REACH apart"""
+
+    first = rng.integers(0, buses, count)
+    offsets = rng.integers(1, min(REACH, buses - 1) + 1, count)
+    second = (first + offsets) % buses
+    return np.stack([first, second])
+
+
+def sort_on(table: Dict[str, np.ndarray], *keys: str) -> Dict[str, np.ndarray]:
+    """Return a table sorted on its key columns, the order psspy lists elements in"""
+
+    order = np.lexsort([table[key] for key in keys[::-1]])
+    return {name: column[order] for name, column in table.items()}
+
+
+def generate_network(buses: int, seed: int = 0) -> Network:
+    """
+    Return a connected synthetic network of `buses` buses with branches,
+    two and three winding transformers and machines in realistic ratios
+    """
+
+    if buses < 2:
+        raise ValueError("A network needs at least 2 buses")
+
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(rng.choice(max(MAX_BUS_NUMBER, 2 * buses), buses, False)) + 1
+    types = np.ones(buses, dtype=np.int64)
+    types[rng.random(buses) < ISOLATED_BUSES] = 4
+    base = rng.choice(BASE_VOLTAGES, buses)
+    pu = rng.normal(1.0, 0.02, buses)
+
+    # A spanning tree keeps the network connected, the other branches mesh it
+    tree_to = np.arange(1, buses)
+    tree_from = np.maximum(tree_to - rng.integers(1, REACH + 1, buses - 1), 0)
+    extra = local_pairs(rng, max(int(buses * BRANCHES_PER_BUS) - buses + 1, 0), buses)
+    lines = np.concatenate([np.stack([tree_from, tree_to]), extra], axis=1)
+    transformers = local_pairs(rng, int(buses * TRANSFORMERS_PER_BUS), buses)
+
+    # Branches and transformers between the same buses share circuit ids
+    ends = np.sort(np.concatenate([lines, transformers], axis=1), axis=0)
+    ids = circuits(*ends)
+    line_ends, transformer_ends = np.split(ends, [lines.shape[1]], axis=1)
+    line_ids, transformer_ids = np.split(ids, [lines.shape[1]])
+
+    def in_service(*indices: np.ndarray) -> np.ndarray:
+        isolated = np.any([types[index] == 4 for index in indices], axis=0)
+        return np.where(isolated | (rng.random(len(indices[0])) < OUT_OF_SERVICE), 0, 1)
+
+    line_count = line_ends.shape[1]
+    rx = rng.uniform(0.001, 0.05, line_count)
+    brn = {
+        "FROMNUMBER": numbers[line_ends[0]],
+        "TONUMBER": numbers[line_ends[1]],
+        "ID": pad(line_ids, 2),
+        "STATUS": in_service(*line_ends),
+        "RX": rx + 1j * rx * rng.uniform(3, 10, line_count),
+        "CHARGING": rng.uniform(0, 0.1, line_count),
+        "P": rng.normal(0, 50, line_count),
+        "Q": rng.normal(0, 15, line_count),
+    }
+    brn["RXZERO"] = brn["RX"] * 3
+    brn["CHARGINGZERO"] = brn["CHARGING"] * 0.6
+
+    transformer_count = transformer_ends.shape[1]
+    x = rng.uniform(0.05, 0.2, transformer_count)
+    trn = {
+        "FROMNUMBER": numbers[transformer_ends[0]],
+        "TONUMBER": numbers[transformer_ends[1]],
+        "ICONTNUMBER": numbers[transformer_ends[1]],
+        "ID": pad(transformer_ids, 2),
+        "XFRNAME": pad(
+            np.char.add("XFR", np.arange(1, transformer_count + 1).astype(str)), 12
+        ),
+        "VECTORGROUP": pad(np.full(transformer_count, "YNd1"), 12),
+        "STATUS": in_service(*transformer_ends),
+        "RXNOM": x / 20 + 1j * x,
+        "RMAX": np.full(transformer_count, 1.1),
+        "RMIN": np.full(transformer_count, 0.9),
+        "VMAX": np.full(transformer_count, 1.05),
+        "VMIN": np.full(transformer_count, 0.95),
+        "SBASE1": rng.choice(TRANSFORMER_BASES, transformer_count),
+        "RATIO": rng.normal(1.0, 0.02, transformer_count),
+    }
+    trn["RXZERO"] = trn["RXNOM"] * 0.9
+
+    three_winding_count = int(buses * THREE_WINDING_TRANSFORMERS_PER_BUS)
+    windings = local_pairs(rng, three_winding_count, buses)
+    third = (windings[1] + rng.integers(1, REACH + 1, three_winding_count)) % buses
+    third = np.where(third == windings[0], (third + 1) % buses, third)
+    windings = np.sort(np.concatenate([windings, third[None]]), axis=0)
+    status = in_service(*windings)
+    tr3 = {
+        "WIND1NUMBER": numbers[windings[0]],
+        "WIND2NUMBER": numbers[windings[1]],
+        "WIND3NUMBER": numbers[windings[2]],
+        "ID": pad(circuits(*windings), 2),
+        "XFRNAME": pad(
+            np.char.add("TR3", np.arange(1, three_winding_count + 1).astype(str)), 12
+        ),
+        "VECTORGROUP": pad(np.full(three_winding_count, "YNyn0d1"), 12),
+        "STATUS": status,
+    }
+    for name, (low, high) in {
+        "RX1-2NOM": (0.05, 0.15),
+        "RX2-3NOM": (0.1, 0.3),
+        "RX3-1NOM": (0.1, 0.3),
+    }.items():
+        x = rng.uniform(low, high, three_winding_count)
+        tr3[name] = x / 25 + 1j * x
+    for winding in (1, 2, 3):
+        tr3[f"Z0{winding}"] = tr3["RX1-2NOM"] * 0.9
+
+    # One row per winding, in transformer order
+    wnd = {
+        "WNDBUSNUMBER": numbers[windings.T.ravel()],
+        "WNDNUMBER": np.tile(np.arange(1, 4), three_winding_count),
+        "ICONTNUMBER": numbers[windings.T.ravel()],
+        "NTPOSN": np.full(3 * three_winding_count, 33),
+        "STATUS": np.repeat(status, 3),
+        "RATIO": rng.normal(1.0, 0.01, 3 * three_winding_count),
+        "RMAX": np.full(3 * three_winding_count, 1.1),
+        "RMIN": np.full(3 * three_winding_count, 0.9),
+        "VMAX": np.full(3 * three_winding_count, 1.05),
+        "VMIN": np.full(3 * three_winding_count, 0.95),
+        "SBASE": np.repeat(rng.choice(TRANSFORMER_BASES, three_winding_count), 3),
+    }
+
+    # Machines sit on a set of generator buses, some with several units
+    machine_count = int(buses * MACHINES_PER_BUS)
+    connected = np.flatnonzero(types != 4)
+    generator_buses = rng.choice(
+        connected,
+        min(max(int(machine_count * GENERATOR_BUSES_PER_MACHINE), 1), len(connected)),
+        replace=False,
+    )
+    machine_buses = rng.choice(generator_buses, machine_count)
+    types[generator_buses] = 2
+    types[generator_buses[0]] = 3
+    mbase = rng.choice(MACHINE_BASES, machine_count)
+    pmax = mbase * 0.9
+    mach = {
+        "NUMBER": numbers[machine_buses],
+        "ID": pad(circuits(machine_buses), 2),
+        "NAME": pad(
+            np.char.add("GEN", np.arange(1, machine_count + 1).astype(str)), 12
+        ),
+        "STATUS": np.where(rng.random(machine_count) < OUT_OF_SERVICE, 0, 1),
+        "MBASE": mbase,
+        "PMAX": pmax,
+        "PMIN": pmax * 0.2,
+        "PGEN": rng.uniform(pmax * 0.2, pmax),
+        "QMAX": mbase * 0.5,
+        "QMIN": mbase * -0.3,
+        "QGEN": rng.uniform(mbase * -0.3, mbase * 0.5),
+    }
+
+    bus = {
+        "NUMBER": numbers,
+        "TYPE": types,
+        "NAME": pad(np.char.add("BUS", numbers.astype(str)), 12),
+        "BASE": base,
+        "PU": pu,
+        "ANGLED": rng.uniform(-30, 30, buses),
+    }
+
+    return {
+        "bus": bus,
+        "brn": sort_on(brn, "FROMNUMBER", "TONUMBER", "ID"),
+        "mach": sort_on(mach, "NUMBER", "ID"),
+        "trn": sort_on(trn, "FROMNUMBER", "TONUMBER", "ID"),
+        "tr3": tr3,
+        "wnd": wnd,
+    }
+
+
+def vary_dispatch(network: Network, seed: int, scale: float = 0.05) -> Network:
+    """
+    Return a copy of a network with the same topology and a different
+    dispatch, i.e. new voltages, flows and machine outputs, like a scenario
+    """
+
+    rng = np.random.default_rng(seed)
+    varied = {subsystem: dict(table) for subsystem, table in network.items()}
+
+    def vary(subsystem: str, attribute: str, spread: float) -> None:
+        column = network[subsystem][attribute]
+        varied[subsystem][attribute] = column + rng.normal(0, spread, len(column))
+
+    vary("bus", "PU", 0.02 * scale)
+    vary("bus", "ANGLED", 10 * scale)
+    vary("brn", "P", 50 * scale)
+    vary("brn", "Q", 15 * scale)
+    vary("trn", "RATIO", 0.02 * scale)
+    mach = varied["mach"]
+    mach["PGEN"] = np.clip(
+        mach["PGEN"] * rng.normal(1, scale, len(mach["PGEN"])),
+        mach["PMIN"],
+        mach["PMAX"],
+    )
+    mach["QGEN"] = np.clip(
+        mach["QGEN"] * rng.normal(1, scale, len(mach["QGEN"])),
+        mach["QMIN"],
+        mach["QMAX"],
+    )
+
+    return varied
+
+
+def save_network(network: Network, fpath: str) -> None:
+    """Save a network to a NumPy archive, whatever the file extension"""
+
+    with open(fpath, "wb") as f:
+        np.savez(
+            f,
+            **{
+                f"{subsystem}/{attribute}": column
+                for subsystem, table in network.items()
+                for attribute, column in table.items()
+            },
+        )
+
+
+def load_network(fpath: str) -> Network:
+    """Load a network saved with `save_network`"""
+
+    network: Network = {}
+    with np.load(fpath) as archive:
+        for key in archive.files:
+            subsystem, attribute = key.split("/", 1)
+            network.setdefault(subsystem, {})[attribute] = archive[key]
+
+    return network
+
+
+def main(args: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("output", help="Case file to write")
+    parser.add_argument("--buses", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--dispatch-seed", type=int, help="Vary the dispatch, e.g. for a scenario"
+    )
+    parsed = parser.parse_args(args)
+
+    network = generate_network(parsed.buses, parsed.seed)
+    if parsed.dispatch_seed is not None:
+        network = vary_dispatch(network, parsed.dispatch_seed)
+    save_network(network, parsed.output)
+
+    counts = ", ".join(
+        f"{len(next(iter(table.values())))} {subsystem}"
+        for subsystem, table in network.items()
+    )
+    print(f"Wrote '{parsed.output}': {counts}")
+
+
+if __name__ == "__main__":
+    main()
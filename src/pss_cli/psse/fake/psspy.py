@@ -0,0 +1,193 @@
+"""
+Fake psspy backed by NumPy arrays, serving the subsystem API from synthetic
+networks written by `pss_cli.psse.fake.network`. Set PSS_CLI_FAKE_PSSE=1 to
+have PsseAPI use it instead of PSSE.
+
+Only the parts of psspy the CLI uses are implemented: psseinit, case, save
+and the a<subsystem>count/int/real/cplx/char/types functions of the bus,
+brn, mach, trn, tr3 and wnd subsystems. Subsystem ids other than -1 select
+every element, and branch flags 3 and 4 don't add transformers.
+"""
+
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pss_cli.psse.fake.network import Network, load_network, save_network
+
+# Subsystem API type of each array kind
+API_TYPES = {"i": "I", "f": "R", "c": "X", "U": "C"}
+
+
+class PsseException(Exception):
+    pass
+
+
+_network: Network = {}
+_bus_limit: Optional[int] = None
+
+
+def _names(number: str) -> Callable[[Network], np.ndarray]:
+    """Return a function looking up the bus names of a bus number column"""
+
+    def names(network: Network) -> np.ndarray:
+        buses = network["bus"]
+        index = np.searchsorted(buses["NUMBER"], network["brn"][number])
+        return buses["NAME"][index]
+
+    return names
+
+
+# Attributes computed from others when requested, instead of being stored
+DERIVED: Dict[str, Dict[str, Callable[[Network], np.ndarray]]] = {
+    "bus": {"KV": lambda network: network["bus"]["PU"] * network["bus"]["BASE"]},
+    "brn": {"FROMNAME": _names("FROMNUMBER"), "TONAME": _names("TONUMBER")},
+}
+
+
+def psseinit(buses: int = 150000) -> int:
+    global _bus_limit
+    _bus_limit = buses
+    return 0
+
+
+def case(fpath: str) -> int:
+    """Load a synthetic network as the working case"""
+
+    global _network
+    try:
+        _network = load_network(os.fspath(fpath))
+    except (OSError, ValueError) as e:
+        raise PsseException(
+            f"'{fpath}' is not a synthetic case, create one with "
+            f"'python -m pss_cli.psse.fake.network': {e}"
+        )
+
+    return 0
+
+
+def save(fpath: str) -> int:
+    """Save the working case"""
+
+    save_network(_check_case(), os.fspath(fpath))
+    return 0
+
+
+def _check_case() -> Network:
+    if _bus_limit is None:
+        raise PsseException("PSSE is not initialised, call psseinit first")
+    if not _network:
+        raise PsseException("No case is loaded")
+
+    return _network
+
+
+def _column(subsystem: str, attribute: str) -> np.ndarray:
+    network = _check_case()
+    if attribute in DERIVED.get(subsystem, {}):
+        return DERIVED[subsystem][attribute](network)
+    if attribute not in network[subsystem]:
+        raise PsseException(f"Invalid {subsystem} attribute '{attribute}'")
+
+    return network[subsystem][attribute]
+
+
+def _in_service(subsystem: str, flag: int) -> Optional[np.ndarray]:
+    """Return a mask of the elements listed for a flag, None for all of them"""
+
+    if flag % 2 == 0:
+        return None
+
+    table = _check_case()[subsystem]
+    if subsystem == "bus":
+        return table["TYPE"] != 4
+
+    return table["STATUS"] == 1
+
+
+def _strings(string: Union[str, Sequence[str]]) -> List[str]:
+    return [string] if isinstance(string, str) else list(string)
+
+
+def _count(subsystem: str) -> Callable[..., Tuple[int, int]]:
+    def count(sid: int = -1, flag: int = 1) -> Tuple[int, int]:
+        mask = _in_service(subsystem, flag)
+        if mask is None:
+            return 0, len(next(iter(_check_case()[subsystem].values())))
+
+        return 0, int(mask.sum())
+
+    return count
+
+
+def _values(subsystem: str, api_type: str) -> Callable[..., Tuple[int, List[list]]]:
+    def values(
+        sid: int = -1, flag: int = 1, string: Union[str, Sequence[str]] = ()
+    ) -> Tuple[int, List[list]]:
+        mask = _in_service(subsystem, flag)
+        columns = []
+        for attribute in _strings(string):
+            column = _column(subsystem, attribute)
+            if API_TYPES[column.dtype.kind] != api_type:
+                raise PsseException(
+                    f"{subsystem} attribute '{attribute}' is not of type {api_type}"
+                )
+            columns.append((column if mask is None else column[mask]).tolist())
+
+        return 0, columns
+
+    return values
+
+
+def _types(subsystem: str) -> Callable[..., Tuple[int, List[str]]]:
+    def types(string: Union[str, Sequence[str]]) -> Tuple[int, List[str]]:
+        return 0, [
+            API_TYPES[_column(subsystem, attribute).dtype.kind]
+            for attribute in _strings(string)
+        ]
+
+    return types
+
+
+abuscount = _count("bus")
+abusint = _values("bus", "I")
+abusreal = _values("bus", "R")
+abuscplx = _values("bus", "X")
+abuschar = _values("bus", "C")
+abustypes = _types("bus")
+
+abrncount = _count("brn")
+abrnint = _values("brn", "I")
+abrnreal = _values("brn", "R")
+abrncplx = _values("brn", "X")
+abrnchar = _values("brn", "C")
+abrntypes = _types("brn")
+
+amachcount = _count("mach")
+amachint = _values("mach", "I")
+amachreal = _values("mach", "R")
+amachcplx = _values("mach", "X")
+amachchar = _values("mach", "C")
+amachtypes = _types("mach")
+
+atrncount = _count("trn")
+atrnint = _values("trn", "I")
+atrnreal = _values("trn", "R")
+atrncplx = _values("trn", "X")
+atrnchar = _values("trn", "C")
+atrntypes = _types("trn")
+
+atr3count = _count("tr3")
+atr3int = _values("tr3", "I")
+atr3real = _values("tr3", "R")
+atr3cplx = _values("tr3", "X")
+atr3char = _values("tr3", "C")
+atr3types = _types("tr3")
+
+awndcount = _count("wnd")
+awndint = _values("wnd", "I")
+awndreal = _values("wnd", "R")
+awndcplx = _values("wnd", "X")
+awndchar = _values("wnd", "C")
+awndtypes = _types("wnd")
@@ -0,0 +1,222 @@
+import hashlib
+import os
+import secrets
+import sys
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from pss_cli.core.config import DAEMON_PATH, TABLE_CACHE_BUDGET
+from pss_cli.core.logging import log
+from pss_cli.core.snapshot import CaseSnapshot
+
+if TYPE_CHECKING:
+    from pss_cli.psse.funcs.pool import Specs
+
+# Requests are tuples of an operation name and its arguments, responses are
+# ("ok", result) or ("error", message) tuples
+Request = Tuple[Any, ...]
+Response = Tuple[str, Any]
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def get_address() -> Tuple[str, str]:
+    """
+    Return the address and family of the daemon of the current directory, a
+    Unix socket in the project data directory or a named pipe on Windows
+    """
+
+    if sys.platform == "win32":
+        digest = hashlib.md5(os.getcwd().encode()).hexdigest()[:12]
+        return rf"\\.\pipe\pss_cli_{digest}", "AF_PIPE"
+
+    return os.path.join(DAEMON_PATH, "psse.sock"), "AF_UNIX"
+
+
+def get_key_path() -> str:
+    """Return the path of the key clients authenticate with"""
+
+    return os.path.join(DAEMON_PATH, "daemon.key")
+
+
+class DaemonClient:
+    """Connection to a running PSSE daemon"""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def request(self, *message: Any) -> Any:
+        """Send a request and return its result, raising DaemonError on failure"""
+
+        self.connection.send(message)
+        status, result = self.connection.recv()
+        if status != "ok":
+            raise DaemonError(result)
+
+        return result
+
+    def extract(
+        self, fpath: str, specs: "Specs", md5_hash: Optional[str] = None
+    ) -> CaseSnapshot:
+        """Extract a snapshot of a case file with one table per named spec"""
+
+        return self.request("extract", os.path.abspath(fpath), dict(specs), md5_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the daemon's process id, uptime and request counters"""
+
+        return self.request("stats")
+
+    def shutdown(self) -> None:
+        """Ask the daemon to exit once this request is answered"""
+
+        self.request("shutdown")
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def connect() -> Optional[DaemonClient]:
+    """Return a client of the daemon of the current directory, None if not running"""
+
+    address, family = get_address()
+    try:
+        with open(get_key_path(), "rb") as f:
+            authkey = f.read()
+        return DaemonClient(Client(address, family=family, authkey=authkey))
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+
+class Daemon:
+    """
+    Long running process holding an initialised PSSE instance, so the
+    case it last loaded stays loaded between CLI invocations. Requests are
+    handled one at a time, as psspy holds a single case per interpreter.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.running = True
+
+    def extract(
+        self, fpath: str, specs: "Specs", md5_hash: Optional[str] = None
+    ) -> CaseSnapshot:
+        from pss_cli.psse.funcs.extract import extract_snapshot
+
+        return extract_snapshot(fpath, specs, md5_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        from pss_cli.psse.funcs.extract import get_api
+
+        api = get_api()
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "requests": self.requests,
+            "case_loads": api.load_count,
+            "loaded_case": api.loaded_case,
+            "table_cache": api.tables.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self.running = False
+
+    def handle(self, message: Request) -> Response:
+        """Run a request and return its response, catching any error"""
+
+        self.requests += 1
+        operation, *args = message
+        handlers = {
+            "extract": self.extract,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+        if operation not in handlers:
+            return "error", f"Unknown request '{operation}'"
+
+        try:
+            return "ok", handlers[operation](*args)
+        except Exception as e:
+            log.exception(f"Request '{operation}' failed")
+            return "error", f"{type(e).__name__}: {e}"
+
+    def serve(self, listener: Listener) -> None:
+        """Answer requests from one client connection at a time until shut down"""
+
+        while self.running:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, EOFError, OSError) as e:
+                # A client with the wrong key, or gone mid handshake
+                log.warning(f"Rejected a daemon connection: {type(e).__name__}: {e}")
+                continue
+
+            with connection:
+                while self.running:
+                    try:
+                        message = connection.recv()
+                        connection.send(self.handle(message))
+                    except (EOFError, OSError):
+                        break
+
+
+def serve(
+    psspy_module: Optional[str] = None, table_cache_budget: Optional[int] = None
+) -> None:
+    """
+    Initialise PSSE and serve requests on the daemon address of the current
+    directory until a shutdown request. `psspy_module` names a module to
+    stand in for psspy, e.g. a stub for testing. `table_cache_budget` sets
+    the memory budget in bytes of the PSSE API's LRU of element tables,
+    which only the daemon keeps, TABLE_CACHE_BUDGET by default.
+    """
+
+    from pss_cli.psse.funcs.pool import _init_worker
+
+    client = connect()
+    if client:
+        client.close()
+        raise DaemonError("A PSSE daemon is already running for this directory.")
+
+    address, family = get_address()
+    os.makedirs(DAEMON_PATH, exist_ok=True)
+    if family == "AF_UNIX" and os.path.exists(address):
+        os.remove(address)
+
+    _init_worker(psspy_module)
+    from pss_cli.psse.funcs.extract import get_api
+
+    api = get_api()
+    api.initialise()
+    api.tables.budget = (
+        TABLE_CACHE_BUDGET if table_cache_budget is None else table_cache_budget
+    )
+
+    authkey = secrets.token_bytes(32)
+    listener = Listener(address, family=family, authkey=authkey)
+    key_path = get_key_path()
+    with open(
+        os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb"
+    ) as f:
+        f.write(authkey)
+
+    log.info(f"PSSE daemon listening on '{address}' (pid {os.getpid()}).")
+    try:
+        Daemon().serve(listener)
+    finally:
+        listener.close()
+        if os.path.exists(key_path):
+            os.remove(key_path)
+        log.info("PSSE daemon stopped.")
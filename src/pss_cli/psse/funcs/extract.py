@@ -1,222 +1,142 @@
-from typing import Any, Dict, List, Union
-from pss_cli.psse.api.base import api
-from pss_cli.utils.convert import get_list_of_dict
-
-
-def extract_data(
-    fpath: str, subsystem_type: str, subsystem_info_mapper: Dict[str, str]
-) -> List[Dict[str, Any]]:
-    """Extract PSSE case data and values, map return quantities to dictionary keys"""
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, NamedTuple, Optional
 
-    api.initialise()
-    api.load_case(fpath)
-    subsystem_info = api.subsystem_info(
-        subsystem_type, list(subsystem_info_mapper.values())
-    )
-    subsystem_info_dict = get_list_of_dict(
-        keys=list(subsystem_info_mapper.keys()),
-        list_of_tuples=subsystem_info,
-    )
-    return subsystem_info_dict
-
-
-def extract_bus_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case bus data"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="bus",
-        subsystem_info_mapper={
-            "bus_number": "NUMBER",
-            "bus_name": "NAME",
-            "bus_base_voltage": "BASE",
-            "bus_type": "TYPE",
-        },
-    )
-    return info_dict
-
-
-def extract_branch_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case branch data"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="brn",
-        subsystem_info_mapper={
-            "from_bus_number": "FROMNUMBER",
-            "to_bus_number": "TONUMBER",
-            "branch_id": "ID",
-            "from_bus_name": "FROMNAME",
-            "to_bus_name": "TONAME",
-            "pos_seq_z_pu": "RX",
-            "zero_seq_z_pu": "RXZERO",
-            "pos_seq_b_pu": "CHARGING",
-            "zero_seq_b_pu": "CHARGINGZERO",
-        },
-    )
-    return info_dict
+import numpy as np
 
+from pss_cli.core.cache import TableKey, load_columns, save_columns, table_nbytes
+from pss_cli.core.metrics import metrics
+from pss_cli.core.snapshot import CaseSnapshot, num_rows
+from pss_cli.utils.convert import get_list_of_dict
 
-def extract_machine_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case machine data"""
+if TYPE_CHECKING:
+    from pss_cli.psse.api.base import PsseAPI
 
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="mach",
-        subsystem_info_mapper={
-            "bus_number": "NUMBER",
-            "machine_id": "ID",
-            "machine_name": "NAME",
-        },
-    )
-    return info_dict
-
-
-def extract_two_winding_transformer_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case two winding transformer data"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="trn",
-        subsystem_info_mapper={
-            "from_bus_number": "FROMNUMBER",
-            "to_bus_number": "TONUMBER",
-            "branch_id": "ID",
-            "xfr_name": "XFRNAME",
-            "pos_seq_impedance_pu": "RXNOM",
-            "zero_seq_impedance_pu": "RXZERO",
-            "vector_group": "VECTORGROUP",
-            "controlled_bus_number": "ICONTNUMBER",
-            "rmax_pu": "RMAX",
-            "rmin_pu": "RMIN",
-            "vmax_pu": "VMAX",
-            "vmin_pu": "VMIN",
-            "sbase_mva": "SBASE1",
-        },
-    )
+# Subsystem API attribute type -> array dtype, so empty columns keep their type
+ATTRIBUTE_DTYPES = {"I": np.int64, "R": np.float64, "X": np.complex128, "C": np.str_}
 
-    return info_dict
-
-
-def extract_three_winding_transformer_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case three winding transformer data"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="tr3",
-        subsystem_info_mapper={
-            "winding_1_bus_number": "WIND1NUMBER",
-            "winding_2_bus_number": "WIND2NUMBER",
-            "winding_3_bus_number": "WIND3NUMBER",
-            "branch_id": "ID",
-            "xfr_name": "XFRNAME",
-            "pos_seq_impedance_1_2_pu": "RX1-2NOM",
-            "pos_seq_impedance_2_3_pu": "RX2-3NOM",
-            "pos_seq_impedance_3_1_pu": "RX3-1NOM",
-            "zero_seq_impedance_1_pu": "Z01",
-            "zero_seq_impedance_2_pu": "Z02",
-            "zero_seq_impedance_3_pu": "Z03",
-            "vector_group": "VECTORGROUP",
-        },
-    )
 
-    return info_dict
-
-
-def extract_winding_definitions(fpath: str) -> List[Dict[str, Any]]:
-    """Extract three winding transformer winding data"""
-
-    # TODO: Incomplete, need more values
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="wnd",
-        subsystem_info_mapper={
-            "winding_bus_number": "WNDBUSNUMBER",
-            "winding_number": "WNDNUMBER",
-            "controlled_bus_number": "ICONTNUMBER",
-            "number_of_taps": "NTPOSN",
-            "ratio": "RATIO",
-            "rmax_pu": "RMAX",
-            "rmin_pu": "RMIN",
-            "vmax_pu": "VMAX",
-            "vmin_pu": "VMIN",
-            "sbase_mva": "SBASE",
-        },
-    )
+class SubsystemSpec(NamedTuple):
+    subsystem_type: str
+    subsystem_info_mapper: Dict[str, str]
 
-    return info_dict
 
+def get_api() -> "PsseAPI":
+    """Return the PSSE API, only importing (and so starting) PSSE on first use"""
 
-def extract_bus_values(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE scenario bus values"""
+    from pss_cli.psse.api.base import api
 
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="bus",
-        subsystem_info_mapper={
-            "bus_number": "NUMBER",
-            "bus_voltage_pu": "PU",
-            "bus_voltage_kv": "KV",
-            "bus_voltage_angle_deg": "ANGLED",
-        },
-    )
-    return info_dict
+    return api
 
 
-def extract_branch_values(
-    fpath: str,
+def extract_data(
+    fpath: str, subsystem_type: str, subsystem_info_mapper: Dict[str, str]
 ) -> List[Dict[str, Any]]:
-    """Extract PSSE scenario branch values"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="brn",
-        subsystem_info_mapper={
-            "from_bus_number": "FROMNUMBER",
-            "to_bus_number": "TONUMBER",
-            "branch_id": "ID",
-            "active_power_mw": "P",
-            "reactive_power_mvar": "Q",
-        },
-    )
-    return info_dict
+    """Extract PSSE case data and values, map return quantities to dictionary keys"""
 
+    api = get_api()
+    with api.case_session(fpath):
+        subsystem_info = api.subsystem_info(
+            subsystem_type, list(subsystem_info_mapper.values())
+        )
+    with metrics.span("extract.dicts") as span:
+        subsystem_info_dict = get_list_of_dict(
+            keys=list(subsystem_info_mapper.keys()),
+            list_of_tuples=subsystem_info,
+        )
+        span.add(rows=len(subsystem_info_dict))
+    return subsystem_info_dict
 
-def extract_machine_values(
-    fpath: str,
-) -> List[Dict[str, Any]]:
-    """Extract PSSE scenario machine values"""
-
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="mach",
-        subsystem_info_mapper={
-            "bus_number": "NUMBER",
-            "machine_id": "ID",
-            "mbase_mva": "MBASE",
-            "active_power_mw": "PGEN",
-            "reactive_power_mvar": "QGEN",
-            "pmax": "PMAX",
-            "pmin": "PMIN",
-            "qmax": "QMAX",
-            "qmin": "QMIN",
-        },
-    )
-    return info_dict
 
+def extract_columns(
+    fpath: str, subsystem_type: str, subsystem_info_mapper: Dict[str, str]
+) -> Dict[str, np.ndarray]:
+    """Extract PSSE case data and values as arrays, keyed on the mapper keys"""
+
+    api = get_api()
+    attributes = list(subsystem_info_mapper.values())
+    with api.case_session(fpath):
+        columns = api.subsystem_columns(subsystem_type, attributes)
+    attr_types = api.attribute_types(subsystem_type, attributes)
+
+    with metrics.span("extract.arrays") as span:
+        arrays = {
+            key: np.asarray(
+                columns[attribute], dtype=ATTRIBUTE_DTYPES[attr_types[attribute]]
+            )
+            for key, attribute in subsystem_info_mapper.items()
+        }
+        span.add(rows=num_rows(arrays), nbytes=table_nbytes(arrays))
+
+    return arrays
+
+
+def extract_snapshot(
+    fpath: str, specs: Mapping[str, SubsystemSpec], md5_hash: Optional[str] = None
+) -> CaseSnapshot:
+    """
+    Extract a columnar snapshot of a case, with one table per named spec.
+    Given the file's `md5_hash`, tables come from the PSSE API's in-memory
+    LRU or the on-disk cache where available, and the case is only loaded
+    if some aren't in either.
+    """
+
+    api = get_api()
+    snapshot = CaseSnapshot()
+    missing = {}
+    for name, spec in specs.items():
+        columns = get_cached_columns(fpath, md5_hash, spec) if md5_hash else None
+        if columns is None:
+            missing[name] = spec
+        else:
+            snapshot.add_table(name, columns)
+
+    if not missing:
+        return snapshot
+
+    with api.case_session(fpath):
+        for name, spec in missing.items():
+            columns = snapshot.add_table(name, extract_columns(fpath, *spec))
+            if md5_hash:
+                save_columns(md5_hash, *spec, columns)
+                api.tables.put(table_key(fpath, md5_hash, spec), columns)
+
+    return snapshot
+
+
+def table_key(fpath: str, md5_hash: str, spec: SubsystemSpec) -> TableKey:
+    """Return the in-memory cache key of a spec's table of a case file"""
+
+    return (
+        os.path.abspath(fpath),
+        md5_hash,
+        spec.subsystem_type.lower(),
+        tuple(spec.subsystem_info_mapper.items()),
+    )
 
-def extract_two_winding_transformer_values(fpath: str) -> List[Dict[str, Any]]:
-    """Extract PSSE case two winding transformer values"""
 
-    info_dict = extract_data(
-        fpath,
-        subsystem_type="trn",
-        subsystem_info_mapper={
-            "from_bus_number": "FROMNUMBER",
-            "to_bus_number": "TONUMBER",
-            "branch_id": "ID",
-            "ratio": "RATIO",
-        },
+def get_cached_columns(
+    fpath: str, md5_hash: str, spec: SubsystemSpec
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Return a spec's columns of a case file from the PSSE API's in-memory LRU,
+    falling back to the on-disk cache, or None if neither has them
+    """
+
+    tables = get_api().tables
+    key = table_key(fpath, md5_hash, spec)
+    columns = tables.get(key)
+    if columns is not None:
+        metrics.count("cache.memory_hit", rows=num_rows(columns))
+        return columns
+
+    columns = load_columns(md5_hash, *spec)
+    if columns is None:
+        metrics.count("cache.miss")
+        return None
+
+    metrics.count(
+        "cache.disk_hit", rows=num_rows(columns), nbytes=table_nbytes(columns)
     )
+    tables.put(key, columns)
 
-    return info_dict
+    return columns
@@ -0,0 +1,107 @@
+import importlib
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, Mapping, Optional, Tuple
+
+from pss_cli.core.logging import log
+from pss_cli.core.metrics import metrics
+from pss_cli.core.snapshot import CaseSnapshot
+from pss_cli.psse.funcs.daemon import DaemonError, connect
+
+if TYPE_CHECKING:
+    from pss_cli.psse.funcs.extract import SubsystemSpec
+
+Specs = Mapping[str, "SubsystemSpec"]
+FileResult = Tuple[str, CaseSnapshot]
+
+
+def _init_worker(psspy_module: Optional[str]) -> None:
+    """Register a stand-in psspy module in a freshly started worker process"""
+
+    if psspy_module:
+        sys.modules["psspy"] = importlib.import_module(psspy_module)
+
+
+def extract_file(
+    fpath: str, specs: Specs, md5_hash: Optional[str] = None
+) -> FileResult:
+    """
+    Extract a columnar snapshot of `fpath` with one table per named spec,
+    from a single load of the case or from the cache of its `md5_hash`
+    """
+
+    # Imported here so the worker initialiser runs before psspy is imported
+    from pss_cli.psse.funcs.extract import extract_snapshot
+
+    return fpath, extract_snapshot(fpath, specs, md5_hash)
+
+
+def extract_files(
+    jobs: Mapping[str, Specs],
+    workers: int = 1,
+    psspy_module: Optional[str] = None,
+    hashes: Optional[Mapping[str, str]] = None,
+    daemon: bool = True,
+) -> Iterator[FileResult]:
+    """
+    Extract a snapshot of each case file in `jobs` (file path -> named specs),
+    yielding results as each file completes.
+
+    With more than one worker, every worker process holds its own PSSE
+    instance and handles whole case files, as psspy only holds one case per
+    interpreter. `psspy_module` names a module to stand in for psspy in the
+    workers, e.g. a stub for testing. Files with an md5 hash in `hashes` are
+    read from and written to the on-disk cache. With one worker and `daemon`
+    set, files are extracted by the PSSE daemon if one is running.
+    """
+
+    hashes = hashes or {}
+
+    client = connect() if daemon and workers <= 1 else None
+    if client:
+        log.info("Extracting through the running PSSE daemon.")
+        for fpath, specs in jobs.items():
+            client = client or connect()
+            if client is None:
+                raise DaemonError("The PSSE daemon stopped during the extraction.")
+
+            # The daemon answers one connection at a time, so each file gets its
+            # own, closed before yielding so the consumer can make requests too
+            with client, metrics.span("daemon.extract") as span:
+                snapshot = client.extract(fpath, specs, hashes.get(fpath))
+                span.add(nbytes=snapshot.nbytes)
+            client = None
+            yield fpath, snapshot
+        return
+
+    if workers <= 1:
+        _init_worker(psspy_module)
+        for fpath, specs in jobs.items():
+            yield extract_file(fpath, specs, hashes.get(fpath))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(psspy_module,)
+    ) as executor:
+        remaining = iter(jobs.items())
+        pending = set()
+
+        def submit(count: int) -> None:
+            for fpath, specs in islice(remaining, count):
+                pending.add(
+                    executor.submit(extract_file, fpath, specs, hashes.get(fpath))
+                )
+
+        # One job per worker is in flight, and the next one is submitted before
+        # a result is yielded, so workers stay busy while only a worker's worth
+        # of snapshots is held here, however many files there are
+        submit(workers)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            submit(len(done))
+            # Stages run in the workers aren't measured, only what they send back
+            for future in done:
+                fpath, snapshot = future.result()
+                metrics.count("worker.snapshot", nbytes=snapshot.nbytes)
+                yield fpath, snapshot
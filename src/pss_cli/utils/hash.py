@@ -1,11 +1,72 @@
 import hashlib
+import mmap
+import os
 
+from pss_cli.core.database import db
+from pss_cli.core.logging import log
+from pss_cli.core.models import FileHash
 
-def get_hash(file_name: str) -> str:
-    """Return md5 hash of a file"""
+CHUNK_SIZE = 1024 * 1024
 
+
+def md5_file(file_name: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Return md5 hash of a file, read in chunks through a memory map"""
+
+    md5 = hashlib.md5()
     with open(file_name, "rb") as f:
-        data = f.read()
-        md5 = hashlib.md5(data).hexdigest()
+        # Empty files can't be memory mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return md5.hexdigest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                for offset in range(0, len(view), chunk_size):
+                    md5.update(view[offset : offset + chunk_size])
+
+    return md5.hexdigest()
+
+
+def get_hash(file_name: str, verify: bool = False) -> str:
+    """
+    Return md5 hash of a file. The hash is cached in the database against the
+    file's size, modification time and inode, so unchanged files are only
+    hashed once. `verify` forces a full re-hash.
+    """
+
+    file_path = os.path.abspath(file_name)
+    stat = os.stat(file_path)
+
+    with db.session() as session:
+        cached = session.get(FileHash, file_path)
+        unchanged = cached is not None and (
+            (cached.size, cached.mtime_ns, cached.inode)
+            == (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        )
+        if unchanged and not verify:
+            return cached.md5_hash  # type: ignore
+
+        md5_hash = md5_file(file_path)
+        if unchanged and cached.md5_hash != md5_hash:  # type: ignore
+            log.warning(f"Cached hash of '{file_name}' was out of date.")
+
+    set_hash(file_path, md5_hash)
+    return md5_hash
+
+
+def set_hash(file_name: str, md5_hash: str) -> None:
+    """Cache a known md5 hash of a file against its current size, mtime and inode"""
+
+    file_path = os.path.abspath(file_name)
+    stat = os.stat(file_path)
 
-    return md5
+    with db.session() as session:
+        session.merge(
+            FileHash(
+                file_path=file_path,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                inode=stat.st_ino,
+                md5_hash=md5_hash,
+            )
+        )
+        session.commit()
@@ -0,0 +1,67 @@
+import sys
+from typing import Optional
+
+
+def get_peak_rss(children: bool = False) -> Optional[int]:
+    """
+    Return the peak resident set size of this process in bytes, or the largest
+    peak of its finished child processes if `children` is set. Returns None
+    where the platform doesn't report it.
+    """
+
+    if sys.platform == "win32":
+        return None if children else _get_peak_working_set()
+
+    import resource
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _get_peak_working_set() -> Optional[int]:
+    """Return the peak working set size of this process on Windows"""
+
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()  # type: ignore
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(  # type: ignore
+        process, ctypes.byref(counters), counters.cb
+    ):
+        return None
+
+    return counters.PeakWorkingSetSize
+
+
+def format_bytes(num_bytes: Optional[int]) -> str:
+    """Return a human readable size, e.g. '12.3 MB'"""
+
+    if num_bytes is None:
+        return "n/a"
+
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            break
+        size /= 1024
+
+    return f"{size:.1f} {unit}"
@@ -0,0 +1,136 @@
+import os
+from typing import Callable, List
+
+import pytest
+from sqlalchemy import Row
+from sqlmodel import select
+from typer.testing import CliRunner, Result
+
+from pss_cli.core.config import FAKE_PSSE_ENV
+
+# Set before PsseAPI is first imported, so every test (and every worker or
+# daemon process it starts) runs against the NumPy backed fake psspy
+os.environ[FAKE_PSSE_ENV] = "1"
+
+from pss_cli.app import app  # noqa: E402
+from pss_cli.core.database import Database, db  # noqa: E402
+from pss_cli.core.models import Case, Scenario, ScenarioCaseLink  # noqa: E402
+from pss_cli.psse.fake.network import (  # noqa: E402
+    Network,
+    generate_network,
+    save_network,
+)
+from pss_cli.psse.funcs.extract import get_api  # noqa: E402
+from pss_cli.utils.hash import get_hash  # noqa: E402
+
+BUSES = 300
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """
+    Run the test in an empty project directory, with its own database and
+    data directory, and a PSSE API without a loaded case
+    """
+
+    monkeypatch.chdir(tmp_path)
+    # The engine resolves its file path when created, so gets replaced
+    monkeypatch.setattr(db, "engine", Database("sqlite.db").engine)
+    api = get_api()
+    api.loaded_case = None
+    api.load_count = 0
+    api.tables.clear()
+    db.create_db_and_tables()
+
+    yield tmp_path
+
+    db.engine.dispose()
+
+
+def copy_network(network: Network) -> Network:
+    """Return a copy of a network whose columns can be changed in place"""
+
+    return {
+        subsystem: {attribute: column.copy() for attribute, column in table.items()}
+        for subsystem, table in network.items()
+    }
+
+
+def rewrite_case(network: Network, fpath: str) -> None:
+    """
+    Save a network over an existing case file, moving its modification time
+    on, as coarse file system timestamps may not change between quick writes
+    """
+
+    before = os.stat(fpath).st_mtime_ns
+    save_network(network, fpath)
+    stat = os.stat(fpath)
+    os.utime(fpath, ns=(stat.st_atime_ns, max(stat.st_mtime_ns, before + 10**6)))
+
+
+@pytest.fixture
+def network() -> Network:
+    return generate_network(BUSES, seed=1)
+
+
+@pytest.fixture
+def cli(project) -> Callable[..., Result]:
+    """Return a function running the CLI in-process and checking it succeeded"""
+
+    runner = CliRunner()
+
+    def invoke(*args: str) -> Result:
+        result = runner.invoke(app, list(args), catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        return result
+
+    return invoke
+
+
+@pytest.fixture
+def add_case(project) -> Callable[[str, Network], Case]:
+    """Return a function saving a network as a case file and adding the case"""
+
+    def add(name: str, network: Network) -> Case:
+        fpath = f"{name}.sav"
+        save_network(network, fpath)
+        case = Case(name=name, file_path=fpath, md5_hash=get_hash(fpath))
+        with db.session() as session:
+            db.add(case, session=session)
+        return case
+
+    return add
+
+
+@pytest.fixture
+def add_scenario(project) -> Callable[[str, List[Case], List[Network]], None]:
+    """
+    Return a function adding a scenario linked to cases, saving one network
+    per case as its scenario file
+    """
+
+    def add(name: str, cases: List[Case], networks: List[Network]) -> None:
+        with db.session() as session:
+            scenario = Scenario(name=name)
+            for case, network in zip(cases, networks):
+                fpath = f"{case.name} - {name}.sav"
+                save_network(network, fpath)
+                session.add(
+                    ScenarioCaseLink(
+                        case_id=case.id,
+                        scenario=scenario,
+                        file_path=fpath,
+                        md5_hash=get_hash(fpath),
+                    )
+                )
+            session.commit()
+
+    return add
+
+
+def select_rows(table, *where) -> List[Row]:
+    """Return the rows of a table, sorted so extraction order doesn't count"""
+
+    statement = select(*table.__table__.columns).where(*where)
+    with db.engine.connect() as connection:
+        return sorted(connection.execute(statement).all())
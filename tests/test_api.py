@@ -0,0 +1,39 @@
+from conftest import rewrite_case
+
+from pss_cli.psse.fake.network import save_network, vary_dispatch
+from pss_cli.psse.funcs.extract import get_api
+
+
+def test_case_session_loads_a_case_once(project, network):
+    save_network(network, "a.sav")
+    api = get_api()
+
+    for _ in range(3):
+        with api.case_session("a.sav"):
+            pass
+
+    assert api.load_count == 1
+
+
+def test_case_session_reloads_a_changed_case_file(project, network):
+    save_network(network, "a.sav")
+    api = get_api()
+    with api.case_session("a.sav"):
+        pass
+
+    rewrite_case(vary_dispatch(network, seed=2), "a.sav")
+    with api.case_session("a.sav"):
+        pass
+
+    assert api.load_count == 2
+
+
+def test_saving_the_loaded_case_keeps_it_loaded(project, network):
+    save_network(network, "a.sav")
+    api = get_api()
+    with api.case_session("a.sav"):
+        api.save_case("a.sav")
+    with api.case_session("a.sav"):
+        pass
+
+    assert api.load_count == 1
@@ -0,0 +1,48 @@
+import os
+
+from conftest import rewrite_case
+
+from pss_cli.core import cache
+from pss_cli.core.cache import prune_cache
+from pss_cli.core.config import CACHE_PATH
+from pss_cli.psse.fake.network import vary_dispatch
+from pss_cli.utils.hash import get_hash
+
+
+def test_extraction_prunes_columns_of_replaced_files(cli, add_case, network):
+    add_case("a", network)
+    cli("extract", "case-data", "--no-daemon")
+    old_hash = get_hash("a.sav")
+
+    rewrite_case(vary_dispatch(network, seed=2), "a.sav")
+    cli("extract", "case-data", "--no-daemon")
+
+    assert os.listdir(CACHE_PATH) == [get_hash("a.sav")]
+    assert old_hash not in os.listdir(CACHE_PATH)
+
+
+def test_cache_commands(cli, add_case, network):
+    add_case("a", network)
+    cli("extract", "case-data", "--no-daemon")
+    os.makedirs(os.path.join(CACHE_PATH, "unreferenced"))
+
+    cli("cache", "prune")
+    assert os.listdir(CACHE_PATH) == [get_hash("a.sav")]
+
+    cli("cache", "clear")
+    assert os.listdir(CACHE_PATH) == []
+
+
+def test_prune_only_counts_deleted_directories(project, monkeypatch):
+    os.makedirs(os.path.join(CACHE_PATH, "a"))
+    os.makedirs(os.path.join(CACHE_PATH, "b"))
+
+    def rmtree(path):
+        if os.path.basename(path) == "a":
+            raise PermissionError("in use")
+        os.rmdir(path)
+
+    monkeypatch.setattr(cache.shutil, "rmtree", rmtree)
+
+    assert prune_cache() == (1, 0)
+    assert os.listdir(CACHE_PATH) == ["a"]
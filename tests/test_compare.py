@@ -0,0 +1,61 @@
+import numpy as np
+
+from pss_cli.core.compare import align, compare_columns, top_movers
+
+
+def machines(numbers, ids, power):
+    return {
+        "bus_number": np.array(numbers),
+        "machine_id": np.array(ids),
+        "active_power_mw": np.array(power, dtype=float),
+    }
+
+
+KEYS = ["bus_number", "machine_id"]
+
+
+def test_same_elements_in_the_same_order_align_in_place():
+    first = machines([1, 1, 2], ["1", "2", "1"], [10, 20, 30])
+    second = machines([1, 1, 2], ["1", "2", "1"], [11, 22, 33])
+
+    first_index, second_index = align(first, second, KEYS)
+
+    np.testing.assert_array_equal(first_index, [0, 1, 2])
+    np.testing.assert_array_equal(second_index, [0, 1, 2])
+
+
+def test_reordered_elements_align_on_every_key():
+    first = machines([1, 1, 2, 3], ["1", "2", "1", "1"], [10, 20, 30, 40])
+    second = machines([2, 1, 4, 1], ["1", "2", "1", "1"], [33, 22, 50, 11])
+
+    first_index, second_index = align(first, second, KEYS)
+
+    pairs = [
+        (first["bus_number"][i], first["machine_id"][i], second["bus_number"][j])
+        for i, j in zip(first_index, second_index)
+    ]
+    assert pairs == [(1, "1", 1), (1, "2", 1), (2, "1", 2)]
+    np.testing.assert_array_equal(
+        first["machine_id"][first_index], second["machine_id"][second_index]
+    )
+
+
+def test_comparisons_count_unmatched_elements():
+    first = machines([1, 1, 2, 3], ["1", "2", "1", "1"], [10, 0, 30, 40])
+    second = machines([2, 1, 4, 1], ["1", "2", "1", "1"], [15, 22, 50, 5])
+
+    comparison = compare_columns(first, second, KEYS, ["active_power_mw"])
+
+    np.testing.assert_array_equal(comparison.keys["bus_number"], [1, 1, 2])
+    np.testing.assert_array_equal(comparison.delta["active_power_mw"], [-5, 22, -15])
+    np.testing.assert_array_equal(
+        comparison.percent["active_power_mw"], [-50, np.nan, -50]
+    )
+    assert (comparison.only_first, comparison.only_second) == (1, 1)
+
+
+def test_top_movers_rank_by_magnitude_with_nan_last():
+    delta = np.array([1.0, -5.0, np.nan, 3.0])
+
+    np.testing.assert_array_equal(top_movers(delta, 2), [1, 3])
+    np.testing.assert_array_equal(top_movers(delta, 10), [1, 3, 0, 2])
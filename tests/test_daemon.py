@@ -0,0 +1,101 @@
+import os
+import time
+from typing import Any, Dict
+
+import pytest
+from conftest import select_rows
+
+from pss_cli.commands.daemon import spawn
+from pss_cli.core.elements import DEFINITION_TABLES, subsystem_specs
+from pss_cli.psse.fake.network import vary_dispatch
+from pss_cli.psse.funcs.daemon import connect, get_key_path
+from pss_cli.psse.funcs.extract import get_api
+from pss_cli.psse.funcs.pool import extract_files
+
+
+@pytest.fixture
+def daemon(project):
+    """Start a PSSE daemon for the project directory, stopping it afterwards"""
+
+    assert spawn(timeout=30), "The daemon didn't start"
+    yield
+
+    client = connect()
+    if client:
+        with client:
+            client.shutdown()
+    deadline = time.monotonic() + 10
+    while os.path.exists(get_key_path()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def daemon_stats() -> Dict[str, Any]:
+    client = connect()
+    assert client, "The daemon isn't running"
+    with client:
+        return client.stats()
+
+
+def daemon_loads() -> int:
+    return daemon_stats()["case_loads"]
+
+
+def test_extracts_through_the_daemon(cli, daemon, add_case, network):
+    add_case("a", network)
+    add_case("b", vary_dispatch(network, seed=2))
+
+    cli("extract", "case-data", "--no-cache")
+
+    assert get_api().load_count == 0
+    assert daemon_loads() == 2
+    for spec in DEFINITION_TABLES:
+        assert select_rows(spec.table)
+
+
+def test_daemon_keeps_extracted_tables_in_memory(cli, daemon, add_case, network):
+    add_case("a", network)
+
+    cli("extract", "case-data")
+    cli("extract", "case-data", "--force")
+
+    assert daemon_loads() == 1
+    specs = subsystem_specs(DEFINITION_TABLES)
+    assert daemon_stats()["table_cache"]["hits"] == len(specs)
+
+
+def test_requests_while_consuming_daemon_results(daemon, add_case, network):
+    paths = [add_case(name, network).file_path for name in "ab"]
+    specs = subsystem_specs(DEFINITION_TABLES)
+
+    # Each connection is closed before its result is yielded, so a consumer
+    # talking to the daemon doesn't wait on the extraction's connection
+    for fpath, snapshot in extract_files({fpath: specs for fpath in paths}):
+        assert snapshot.num_rows("bus")
+        assert daemon_loads() >= 1
+
+
+def test_falls_back_to_extracting_in_process(cli, add_case, network):
+    add_case("a", network)
+
+    cli("extract", "case-data", "--no-cache")
+
+    assert get_api().load_count == 1
+    for spec in DEFINITION_TABLES:
+        assert select_rows(spec.table)
+
+
+def test_survives_clients_with_a_wrong_key(cli, daemon, add_case, network):
+    add_case("a", network)
+    key_path = get_key_path()
+    with open(key_path, "rb") as f:
+        key = f.read()
+    with open(key_path, "wb") as f:
+        f.write(os.urandom(len(key)))
+
+    # The handshake fails, so the extraction runs in this process instead
+    cli("extract", "case-data", "--no-cache")
+    assert get_api().load_count == 1
+
+    with open(key_path, "wb") as f:
+        f.write(key)
+    assert daemon_loads() == 0
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import inspect, text
+
+from pss_cli.core.database import SCHEMA_VERSION, Database
+
+# The tables as the first release created them, before the hash columns and
+# with definitions keyed on the element alone
+BASELINE_TABLES = (
+    """
+    CREATE TABLE "case" (
+        id INTEGER NOT NULL,
+        name VARCHAR NOT NULL,
+        file_path VARCHAR NOT NULL,
+        md5_hash VARCHAR NOT NULL,
+        description VARCHAR,
+        rel_path VARCHAR,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE busdefinition (
+        case_id INTEGER,
+        bus_number INTEGER NOT NULL,
+        bus_name VARCHAR NOT NULL,
+        bus_base_voltage FLOAT NOT NULL,
+        bus_type INTEGER NOT NULL,
+        PRIMARY KEY (bus_number),
+        FOREIGN KEY(case_id) REFERENCES "case" (id)
+    )
+    """,
+    """INSERT INTO "case" (id, name, file_path, md5_hash)
+    VALUES (1, 'a', 'a.sav', 'x')""",
+    "INSERT INTO busdefinition VALUES (1, 101, 'BUS 101', 132.0, 1)",
+)
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    """Return a database file shaped like one made by the first release"""
+
+    database = Database(str(tmp_path / "baseline.db"))
+    with database.engine.begin() as connection:
+        for statement in BASELINE_TABLES:
+            connection.execute(text(statement))
+
+    yield database
+
+    database.engine.dispose()
+
+
+def test_baseline_databases_are_migrated(baseline):
+    baseline.create_db_and_tables()
+
+    inspector = inspect(baseline.engine)
+    columns = {column["name"] for column in inspector.get_columns("case")}
+    assert {"extracted_hash", "topology_hash", "definition_hash"} <= columns
+    primary_key = inspector.get_pk_constraint("busdefinition")["constrained_columns"]
+    assert set(primary_key) == {"case_id", "bus_number"}
+    assert baseline.get_schema_version() == SCHEMA_VERSION
+
+    with baseline.engine.begin() as connection:
+        assert connection.execute(
+            text('SELECT name, md5_hash, extracted_hash FROM "case"')
+        ).all() == [("a", "x", None)]
+        # Another case can now define the same bus
+        connection.execute(
+            text("INSERT INTO busdefinition VALUES (2, 101, 'BUS 101', 132.0, 1)")
+        )
+        assert connection.execute(
+            text("SELECT case_id, bus_number FROM busdefinition ORDER BY case_id")
+        ).all() == [(1, 101), (2, 101)]
+
+
+def test_migrating_again_changes_nothing(baseline):
+    baseline.create_db_and_tables()
+    with baseline.engine.connect() as connection:
+        schema = connection.execute(text("SELECT sql FROM sqlite_master")).all()
+
+    baseline.create_db_and_tables()
+
+    with baseline.engine.connect() as connection:
+        assert connection.execute(text("SELECT sql FROM sqlite_master")).all() == schema
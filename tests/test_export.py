@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+
+import pytest
+from conftest import select_rows
+
+from pss_cli.core.models import BusDefinition, BusValues
+from pss_cli.psse.fake.network import vary_dispatch
+
+
+@pytest.fixture
+def extracted(cli, add_case, add_scenario, network):
+    """Extract a case and a scenario of it"""
+
+    case = add_case("a", network)
+    add_scenario("s", [case], [vary_dispatch(network, seed=2)])
+    cli("extract", "case-data", "--no-daemon")
+    cli("extract", "scenario-data", "--no-daemon")
+
+
+def read_csv(fpath: str):
+    with open(fpath, newline="") as f:
+        return list(csv.reader(f))
+
+
+def read_jsonl(fpath: str):
+    with open(fpath) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_csv_has_a_header_and_every_batch(cli, extracted):
+    cli("export", "table", "busdefinition", "buses.csv", "--batch-size", "7")
+
+    header, *rows = read_csv("buses.csv")
+    assert header == [column.name for column in BusDefinition.__table__.columns]
+    expected = select_rows(BusDefinition)
+    assert sorted(tuple(row) for row in rows) == sorted(
+        tuple(str(value) for value in row) for row in expected
+    )
+
+
+def test_jsonl_keeps_value_types(cli, extracted):
+    buses = select_rows(BusDefinition)
+    last = sorted(row.bus_number for row in buses)[9]
+    cli(
+        "export",
+        "table",
+        "busdefinition",
+        "buses.jsonl",
+        "--columns",
+        "bus_number, bus_base_voltage",
+        "--where",
+        f"bus_number <= {last}",
+        "--order-by",
+        "bus_number DESC",
+        "--batch-size",
+        "3",
+    )
+
+    rows = read_jsonl("buses.jsonl")
+    expected = [
+        {"bus_number": row.bus_number, "bus_base_voltage": row.bus_base_voltage}
+        for row in buses
+        if row.bus_number <= last
+    ]
+    assert len(rows) == 10
+    assert rows == sorted(expected, key=lambda row: -row["bus_number"])
+    assert isinstance(rows[0]["bus_number"], int)
+    assert isinstance(rows[0]["bus_base_voltage"], float)
+
+
+def test_results_are_joined_with_their_definitions(cli, extracted):
+    cli("export", "results", "bus", "buses.jsonl", "--limit", "5")
+
+    rows = read_jsonl("buses.jsonl")
+    assert len(rows) == 5
+    names = {row.bus_number: row.bus_name for row in select_rows(BusDefinition)}
+    for row in rows:
+        assert row["bus_name"] == names[row["bus_number"]]
+        assert set(BusValues.__table__.columns.keys()) <= row.keys()
+
+
+def test_unknown_formats_write_nothing(cli, extracted):
+    cli("export", "table", "busdefinition", "buses.txt")
+    cli("export", "table", "busdefinition", "buses.csv", "--format", "xml")
+
+    assert not os.path.exists("buses.txt")
+    assert not os.path.exists("buses.csv")
+
+
+def test_parquet_matches_the_table(cli, extracted):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    cli("export", "table", "busdefinition", "buses.parquet", "--batch-size", "7")
+
+    table = pq.read_table("buses.parquet")
+    assert table.num_rows == len(select_rows(BusDefinition))
+    assert table.schema.field("bus_number").type == "int64"
@@ -0,0 +1,128 @@
+from typing import List
+
+import numpy as np
+import pytest
+from conftest import copy_network, rewrite_case, select_rows
+
+from pss_cli.core.database import db
+from pss_cli.core.elements import DEFINITION_TABLES, VALUES_TABLES
+from pss_cli.core.models import BranchDefinition, Case
+from pss_cli.psse.fake.network import vary_dispatch
+from pss_cli.psse.funcs.extract import get_api
+from pss_cli.utils.hash import get_hash
+
+
+def get_case(name: str) -> Case:
+    return db.select_table("case", Case.name == name)[0]  # type: ignore
+
+
+def test_case_data_loads_each_case_once(cli, add_case, network):
+    add_case("a", network)
+    add_case("b", vary_dispatch(network, seed=2))
+
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+
+    # One load per case file, however many tables and attribute types it fills
+    assert get_api().load_count == 2
+    for spec in DEFINITION_TABLES:
+        assert select_rows(spec.table)
+
+
+def test_cached_case_data_is_not_loaded_again(cli, add_case, network):
+    add_case("a", network)
+    add_case("b", vary_dispatch(network, seed=2))
+
+    cli("extract", "case-data", "--no-daemon")
+    cli("extract", "case-data", "--no-daemon", "--force")
+
+    assert get_api().load_count == 2
+    # Read from the disk cache, as a one-shot command keeps no tables in memory
+    assert len(get_api().tables) == 0
+
+
+def test_scenario_data_loads_each_scenario_file_once(
+    cli, add_case, add_scenario, network
+):
+    case = add_case("a", network)
+    add_scenario("s", [case], [vary_dispatch(network, seed=2)])
+    add_scenario("t", [case], [vary_dispatch(network, seed=3)])
+
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+    cli("extract", "scenario-data", "--no-daemon", "--no-cache")
+
+    assert get_api().load_count == 3
+    for spec in VALUES_TABLES:
+        assert len({row.scenario_id for row in select_rows(spec.table)}) == 2
+
+
+def test_unchanged_case_files_are_skipped(cli, add_case, network):
+    add_case("a", network)
+
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+
+    assert get_api().load_count == 1
+
+
+@pytest.fixture
+def rewrites(monkeypatch) -> List[str]:
+    """Record the file of every case or scenario case link whose rows are rewritten"""
+
+    from pss_cli.commands import extract
+
+    calls = []
+    replace_rows = extract.replace_rows
+
+    def record(owner, *args, **kwargs):
+        calls.append(owner.file_path)
+        return replace_rows(owner, *args, **kwargs)
+
+    monkeypatch.setattr(extract, "replace_rows", record)
+    return calls
+
+
+def test_dispatch_changes_leave_case_definitions_in_place(
+    cli, add_case, network, rewrites
+):
+    add_case("a", network)
+    cli("extract", "case-data", "--no-daemon")
+    rows = select_rows(BranchDefinition)
+
+    rewrite_case(vary_dispatch(network, seed=2), "a.sav")
+    cli("extract", "case-data", "--no-daemon")
+
+    case = get_case("a")
+    assert rewrites == ["a.sav"]
+    assert select_rows(BranchDefinition) == rows
+    assert case.md5_hash == get_hash("a.sav")
+    assert case.extracted_hash == case.md5_hash
+
+    # Recorded as extracted, so the next run skips it without reading it
+    get_api().load_count = 0
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+    assert get_api().load_count == 0
+
+
+def test_definition_changes_are_rewritten(cli, add_case, network, rewrites):
+    add_case("a", network)
+    cli("extract", "case-data", "--no-daemon")
+
+    changed = copy_network(network)
+    branches = changed["brn"]
+    first, second = np.flatnonzero(branches["STATUS"] == 1)[:2]
+    branches["RX"][first] += 1 + 1j
+    branches["CHARGING"][second] += 0.5
+    rewrite_case(changed, "a.sav")
+    cli("extract", "case-data", "--no-daemon")
+
+    case = get_case("a")
+    assert rewrites == ["a.sav", "a.sav"]
+    assert case.extracted_hash == case.md5_hash == get_hash("a.sav")
+    rows = select_rows(BranchDefinition)
+    in_service = branches["STATUS"] == 1
+    assert sorted(row.pos_seq_r_pu for row in rows) == sorted(
+        branches["RX"][in_service].real
+    )
+    assert sorted(row.pos_seq_b_pu for row in rows) == sorted(
+        branches["CHARGING"][in_service]
+    )
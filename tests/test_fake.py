@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pss_cli.core.snapshot import topology_fingerprint
+from pss_cli.psse.fake import psspy
+from pss_cli.psse.fake.network import (
+    generate_network,
+    load_network,
+    save_network,
+    vary_dispatch,
+)
+from pss_cli.psse.funcs.extract import get_api
+
+
+def test_networks_round_trip_through_files(project, network):
+    save_network(network, "a.sav")
+    loaded = load_network("a.sav")
+
+    assert loaded.keys() == network.keys()
+    for subsystem, table in network.items():
+        for attribute, column in table.items():
+            np.testing.assert_array_equal(loaded[subsystem][attribute], column)
+
+
+def test_generated_networks_are_reproducible():
+    first, second = generate_network(200, seed=4), generate_network(200, seed=4)
+
+    np.testing.assert_array_equal(first["brn"]["RX"], second["brn"]["RX"])
+
+
+def test_vary_dispatch_keeps_the_topology(network):
+    varied = vary_dispatch(network, seed=2)
+
+    def keys(network):
+        return {
+            "bus": {"NUMBER": network["bus"]["NUMBER"]},
+            "brn": {
+                name: network["brn"][name] for name in ("FROMNUMBER", "TONUMBER", "ID")
+            },
+        }
+
+    assert topology_fingerprint(keys(varied)) == topology_fingerprint(keys(network))
+    assert not np.array_equal(varied["mach"]["PGEN"], network["mach"]["PGEN"])
+
+
+def test_subsystem_api_lists_in_service_elements(project, network):
+    save_network(network, "a.sav")
+    api = get_api()
+
+    with api.case_session("a.sav"):
+        columns = api.subsystem_columns("brn", ["FROMNUMBER", "RX", "ID"])
+        everything = api.subsystem_columns("brn", ["FROMNUMBER"], inservice=False)
+
+    in_service = network["brn"]["STATUS"] == 1
+    np.testing.assert_array_equal(columns["RX"], network["brn"]["RX"][in_service])
+    assert len(columns["FROMNUMBER"]) == psspy.abrncount()[1] == in_service.sum()
+    assert len(everything["FROMNUMBER"]) == len(in_service)
+
+
+def test_rejects_files_that_are_not_synthetic_cases(project):
+    with open("a.sav", "wb") as f:
+        f.write(b"not a case")
+
+    with pytest.raises(psspy.PsseException):
+        psspy.case("a.sav")
@@ -0,0 +1,92 @@
+import hashlib
+import os
+from typing import List
+
+import pytest
+
+from pss_cli.core.database import db
+from pss_cli.psse.fake.network import save_network, vary_dispatch
+from pss_cli.utils import hash as hash_module
+from pss_cli.utils.hash import get_hash, md5_file
+
+
+@pytest.fixture
+def hashed(project, monkeypatch) -> List[str]:
+    """Return the files hashed in full, in order"""
+
+    files: List[str] = []
+
+    def md5(file_name: str) -> str:
+        files.append(os.path.basename(file_name))
+        return md5_file(file_name)
+
+    monkeypatch.setattr(hash_module, "md5_file", md5)
+    return files
+
+
+def overwrite_in_place(fpath: str, data: bytes) -> None:
+    """Change a file's content keeping its size and modification time"""
+
+    stat = os.stat(fpath)
+    with open(fpath, "r+b") as f:
+        f.write(data)
+    os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_md5_file_reads_every_chunk(tmp_path):
+    fpath = tmp_path / "a.bin"
+    data = os.urandom(10000)
+    fpath.write_bytes(data)
+    (tmp_path / "empty.bin").write_bytes(b"")
+
+    assert md5_file(str(fpath), chunk_size=4096) == hashlib.md5(data).hexdigest()
+    assert md5_file(str(tmp_path / "empty.bin")) == hashlib.md5().hexdigest()
+
+
+def test_unchanged_files_are_hashed_once(hashed):
+    with open("a.bin", "wb") as f:
+        f.write(b"first")
+
+    assert get_hash("a.bin") == get_hash("a.bin") == hashlib.md5(b"first").hexdigest()
+    assert hashed == ["a.bin"]
+
+
+def test_rewritten_files_are_hashed_again(hashed):
+    with open("a.bin", "wb") as f:
+        f.write(b"first")
+    get_hash("a.bin")
+
+    with open("a.bin", "wb") as f:
+        f.write(b"second file")
+
+    assert get_hash("a.bin") == hashlib.md5(b"second file").hexdigest()
+    assert hashed == ["a.bin", "a.bin"]
+
+
+def test_verify_rehashes_files_changed_in_place(hashed):
+    with open("a.bin", "wb") as f:
+        f.write(b"first")
+    get_hash("a.bin")
+    overwrite_in_place("a.bin", b"other")
+
+    # The stat didn't change, so only a verify notices
+    assert get_hash("a.bin") == hashlib.md5(b"first").hexdigest()
+    assert get_hash("a.bin", verify=True) == hashlib.md5(b"other").hexdigest()
+    assert get_hash("a.bin") == hashlib.md5(b"other").hexdigest()
+    assert hashed == ["a.bin", "a.bin"]
+
+
+def test_extract_verify_picks_up_files_changed_in_place(cli, add_case, network):
+    add_case("a", network)
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+    save_network(vary_dispatch(network, seed=2), "b.sav")
+    with open("b.sav", "rb") as f:
+        overwrite_in_place("a.sav", f.read())
+
+    cli("extract", "case-data", "--no-daemon", "--no-cache")
+    (case,) = db.select_table("case")
+    assert case.extracted_hash != md5_file("a.sav")  # type: ignore
+
+    cli("extract", "case-data", "--no-daemon", "--no-cache", "--verify")
+    (case,) = db.select_table("case")
+    assert case.extracted_hash == md5_file("a.sav")  # type: ignore
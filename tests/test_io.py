@@ -0,0 +1,107 @@
+import hashlib
+import os
+from typing import List
+
+import pytest
+
+from pss_cli.core import io
+from pss_cli.core.io import break_hardlink, provision_file, provision_files
+from pss_cli.psse.fake.network import save_network, vary_dispatch
+from pss_cli.psse.funcs.extract import get_api
+
+DATA = os.urandom(3 * io.CHUNK_SIZE + 100)
+
+
+@pytest.fixture
+def src(tmp_path) -> str:
+    fpath = tmp_path / "a.sav"
+    fpath.write_bytes(DATA)
+    return str(fpath)
+
+
+def read(fpath: str) -> bytes:
+    with open(fpath, "rb") as f:
+        return f.read()
+
+
+def test_hardlinks_share_the_file(src, tmp_path):
+    dst = str(tmp_path / "b.sav")
+    with open(dst, "wb") as f:
+        f.write(b"replaced")
+
+    provisioned = provision_file(src, dst, hardlink=True)
+
+    assert provisioned.method == "hardlink"
+    assert provisioned.md5_hash is None
+    assert os.path.samefile(src, dst)
+
+
+def test_buffered_copies_are_hashed(src, tmp_path, monkeypatch):
+    monkeypatch.setattr(io, "reflink", lambda src, dst: False)
+    monkeypatch.setattr(io, "copy_range", lambda src, dst, advance: False)
+    dst = str(tmp_path / "b.sav")
+    advanced: List[int] = []
+
+    provisioned = provision_file(src, dst, advance=advanced.append)
+
+    assert provisioned.method == "copy"
+    assert provisioned.md5_hash == hashlib.md5(DATA).hexdigest()
+    assert read(dst) == DATA
+    assert not os.path.samefile(src, dst)
+    assert sum(advanced) == len(DATA)
+
+
+def test_failed_kernel_copies_fall_back_to_a_buffered_copy(src, tmp_path, monkeypatch):
+    calls = []
+
+    def fail_second_call(src_fd: int, dst_fd: int, count: int) -> int:
+        calls.append(count)
+        if len(calls) > 1:
+            raise OSError("cross device")
+        return os.write(dst_fd, os.read(src_fd, io.CHUNK_SIZE))
+
+    monkeypatch.setattr(io, "reflink", lambda src, dst: False)
+    monkeypatch.setattr(io.os, "copy_file_range", fail_second_call, raising=False)
+    dst = str(tmp_path / "b.sav")
+    advanced: List[int] = []
+
+    provisioned = provision_file(src, dst, advance=advanced.append)
+
+    assert provisioned.method == "copy"
+    assert read(dst) == DATA
+    # The progress of the abandoned kernel copy is taken back
+    assert sum(advanced) == len(DATA)
+
+
+def test_provisions_every_pair(src, tmp_path):
+    pairs = [(src, str(tmp_path / f"{name}.sav")) for name in "bcd"]
+
+    provisioned = provision_files(pairs, threads=2)
+
+    assert [file.dst for file in provisioned] == [dst for _, dst in pairs]
+    for _, dst in pairs:
+        assert read(dst) == DATA
+
+
+def test_break_hardlink_leaves_plain_files_alone(src):
+    inode = os.stat(src).st_ino
+
+    break_hardlink(src)
+    break_hardlink(src + ".missing")
+
+    assert os.stat(src).st_ino == inode
+
+
+def test_saving_a_hardlinked_case_keeps_the_source(project, network):
+    save_network(network, "a.sav")
+    original = read("a.sav")
+    provision_file("a.sav", "b.sav", hardlink=True)
+    save_network(vary_dispatch(network, seed=2), "c.sav")
+    api = get_api()
+
+    with api.case_session("c.sav"):
+        api.save_case("b.sav")
+
+    assert read("a.sav") == original
+    assert read("b.sav") == read("c.sav")
+    assert os.stat("a.sav").st_nlink == os.stat("b.sav").st_nlink == 1
@@ -0,0 +1,30 @@
+from conftest import select_rows
+
+from pss_cli.core.elements import DEFINITION_TABLES, VALUES_TABLES
+from pss_cli.psse.fake.network import vary_dispatch
+from pss_cli.psse.funcs.extract import get_api
+
+
+def extract_all(cli, *options: str):
+    cli("extract", "case-data", "--no-daemon", "--force", *options)
+    cli("extract", "scenario-data", "--no-daemon", "--force", *options)
+
+    return {
+        spec.name: select_rows(spec.table) for spec in DEFINITION_TABLES + VALUES_TABLES
+    }
+
+
+def test_workers_extract_the_same_rows(cli, add_case, add_scenario, network):
+    cases = [
+        add_case(name, vary_dispatch(network, seed=seed))
+        for seed, name in enumerate("abc")
+    ]
+    add_scenario("s", cases, [vary_dispatch(network, seed=seed) for seed in (4, 5, 6)])
+
+    expected = extract_all(cli, "--no-cache")
+    assert all(expected.values())
+    get_api().load_count = 0
+
+    assert extract_all(cli, "--no-cache", "--workers", "2") == expected
+    # Keys and values are both read in the workers, never in this process
+    assert get_api().load_count == 0
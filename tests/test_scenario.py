@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from conftest import copy_network, select_rows
+
+from pss_cli.commands import extract
+from pss_cli.core.database import db
+from pss_cli.core.models import BranchValues, MachineValues
+from pss_cli.psse.fake.network import Network, vary_dispatch
+from pss_cli.psse.funcs.pool import extract_files
+
+
+def in_service_values(table, keys, quantity):
+    """Return the element keys -> quantity of the in-service elements of a table"""
+
+    mask = table["STATUS"] == 1
+    columns = [
+        np.char.strip(table[key]) if table[key].dtype.kind == "U" else table[key]
+        for key in keys
+    ]
+    elements = zip(*(column[mask].tolist() for column in columns))
+    return dict(zip(elements, table[quantity][mask].tolist()))
+
+
+@pytest.fixture
+def scenario(cli, add_case, add_scenario, network) -> Network:
+    """
+    Extract a case and a scenario of it whose machines are reordered and one
+    re-IDed, with branches switched out and in, returning the scenario network
+    """
+
+    base = copy_network(network)
+    branches = base["brn"]
+    switched_in = np.flatnonzero(branches["STATUS"] == 1)[3:5]
+    branches["STATUS"][switched_in] = 0
+
+    changed = copy_network(vary_dispatch(network, seed=2))
+    branches = changed["brn"]
+    switched_out = np.flatnonzero(branches["STATUS"] == 1)[:3]
+    branches["STATUS"][switched_out] = 0
+    machines = changed["mach"]
+    machines["ID"][0] = "9"
+    machines["STATUS"][0] = 1
+    order = np.random.default_rng(3).permutation(len(machines["ID"]))
+    changed["mach"] = {name: column[order] for name, column in machines.items()}
+
+    case = add_case("a", base)
+    add_scenario("s", [case], [changed])
+    cli("extract", "case-data", "--no-daemon")
+    cli("extract", "scenario-data", "--no-daemon")
+
+    return changed
+
+
+def test_values_are_stored_under_the_scenario_keys(scenario):
+    machines = {
+        (row.bus_number, row.machine_id): row.active_power_mw
+        for row in select_rows(MachineValues)
+    }
+    assert machines == in_service_values(scenario["mach"], ["NUMBER", "ID"], "PGEN")
+    assert "9" in {machine_id for _, machine_id in machines}
+
+    branches = {
+        (row.from_bus_number, row.to_bus_number, row.branch_id): row.active_power_mw
+        for row in select_rows(BranchValues)
+    }
+    assert branches == in_service_values(
+        scenario["brn"], ["FROMNUMBER", "TONUMBER", "ID"], "P"
+    )
+
+
+def test_scenario_topology_hash_is_its_own(scenario):
+    (case,) = db.select_table("case")
+    (link,) = db.select_table("scenariocaselink")
+
+    assert link.topology_hash  # type: ignore
+    assert link.topology_hash != case.topology_hash  # type: ignore
+
+
+def test_copies_of_the_case_reuse_its_keys(
+    cli, monkeypatch, add_case, add_scenario, network
+):
+    jobs = {}
+
+    def spy(files, **kwargs):
+        jobs.update(files)
+        return extract_files(files, **kwargs)
+
+    monkeypatch.setattr(extract, "extract_files", spy)
+    changed = vary_dispatch(network, seed=2)
+    case = add_case("a", network)
+    add_scenario("copy", [case], [network])
+    add_scenario("changed", [case], [changed])
+    cli("extract", "case-data", "--no-daemon")
+    cli("extract", "scenario-data", "--no-daemon")
+
+    # Only the copy of the case skips reading its keys
+    assert "NUMBER" not in jobs["a - copy.sav"]["mach"].subsystem_info_mapper
+    assert "NUMBER" in jobs["a - changed.sav"]["mach"].subsystem_info_mapper
+
+    (case,) = db.select_table("case")
+    links = {link.file_path: link for link in db.select_table("scenariocaselink")}
+    assert links["a - copy.sav"].topology_hash == case.topology_hash  # type: ignore
+    for fpath, source in [("a - copy.sav", network), ("a - changed.sav", changed)]:
+        scenario_id = links[fpath].scenario_id  # type: ignore
+        machines = {
+            (row.bus_number, row.machine_id): row.active_power_mw
+            for row in select_rows(
+                MachineValues, MachineValues.scenario_id == scenario_id
+            )
+        }
+        assert machines == in_service_values(source["mach"], ["NUMBER", "ID"], "PGEN")
@@ -0,0 +1,47 @@
+from typing import Iterator, List
+
+import pytest
+from rich.console import Console
+
+from pss_cli.core.ui import print_pages
+
+
+@pytest.fixture
+def prompts(monkeypatch) -> List[str]:
+    """Run print_pages as on a terminal, answering <enter> to every prompt"""
+
+    asked: List[str] = []
+
+    def answer(self, prompt: str = "") -> str:
+        asked.append(prompt)
+        return ""
+
+    monkeypatch.setattr(Console, "is_terminal", property(lambda self: True))
+    monkeypatch.setattr(Console, "input", answer)
+    return asked
+
+
+def numbers(count: int, fetched: List[int]) -> Iterator[tuple]:
+    for number in range(count):
+        fetched.append(number)
+        yield (number,)
+
+
+def test_pages_prompt_only_before_more_rows(prompts):
+    assert print_pages("t", ["n"], numbers(10, []), page_size=3) == 10
+    assert len(prompts) == 3
+
+
+def test_full_last_page_ends_without_a_prompt(prompts):
+    assert print_pages("t", ["n"], numbers(6, []), page_size=3) == 6
+    assert len(prompts) == 1
+
+
+def test_quitting_doesnt_fetch_another_page(monkeypatch):
+    monkeypatch.setattr(Console, "is_terminal", property(lambda self: True))
+    monkeypatch.setattr(Console, "input", lambda self, prompt="": "q")
+    fetched: List[int] = []
+
+    assert print_pages("t", ["n"], numbers(10, fetched), page_size=3) == 3
+    # The first page and the row read ahead to know there are more
+    assert fetched == [0, 1, 2, 3]